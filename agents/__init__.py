@@ -1 +1,14 @@
-# Agents package for LangChain agent implementations
\ No newline at end of file
+# Agents package for LangChain agent implementations
+
+
+def __getattr__(name):
+    """Lazily re-export the agent classes (PEP 562).
+
+    `import agents` stays a no-op; the finance_agent module (and its
+    LangChain stack on first construction) only loads when an attribute
+    is actually requested.
+    """
+    if name in ("FinanceAgent", "FinanceAgentError"):
+        from agents.finance_agent import FinanceAgent, FinanceAgentError
+        return {"FinanceAgent": FinanceAgent, "FinanceAgentError": FinanceAgentError}[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,115 +1,214 @@
 """Unified Finance Agent with advanced routing capabilities."""
 
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
 import sys
 import re
 import logging
-from typing import List, Dict, Optional, TypedDict, Literal
-
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.agents import create_tool_calling_agent, AgentExecutor
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema import BaseMessage, HumanMessage, AIMessage, SystemMessage
-from langgraph.graph import StateGraph, START, END
-from langgraph.graph.message import add_messages
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from dataclasses import dataclass, field
+from typing import Deque, List, Dict, Optional, Tuple, Literal
 
 from config.settings import settings
-from tools.trading_tools import generate_rust_crypto_algo, build_docker_image_only
-from tools.rag_tools import search_knowledge_base, add_to_knowledge_base, search_trading_strategies, get_knowledge_base_stats
-from tools.technical_indicators_tool import (
-    get_mfi_analysis, validate_stock_symbol, get_technical_indicators,
-    extract_symbols_from_text, build_indicators_context
-)
-from tools.technical_indicators_client import TechnicalIndicatorsClient
 
 logger = logging.getLogger(__name__)
 
+# Ticker-like tokens in an (uppercased) LLM extraction reply; one findall
+# pass replaces a Python loop of per-candidate re.sub calls
+_SYMBOL_TOKEN = re.compile(r'\b[A-Z]{1,5}\b')
 
-class AgentState(TypedDict):
-    """State for the LangGraph routing system."""
-    messages: List[BaseMessage]
-    query_type: Optional[str]
-    symbols: List[str]
-    technical_data: Optional[str]
-    user_message: str
-    route_taken: Optional[str]
 
+def _use_langgraph() -> bool:
+    """Whether to route through the compiled LangGraph instead of direct dispatch."""
+    return os.getenv('AGENT_USE_LANGGRAPH', '').lower() in ('true', '1', 'yes', 'on')
 
-class FinanceAgentError(Exception):
-    """Exception raised when Finance Agent operations fail."""
-    pass
 
+def _exact_cache_enabled() -> bool:
+    """Whether the exact-match response cache is enabled via environment."""
+    return os.getenv('FINANCE_AGENT_CACHE', '').lower() in ('true', '1', 'yes', 'on')
 
-class FinanceAgent:
-    """Unified Finance Agent with intelligent routing, RAG, code generation, Docker, and technical analysis capabilities."""
-    
-    def __init__(self):
-        # Validate settings
-        try:
-            settings.validate_required_settings()
-        except Exception as e:
-            print(f"Error: Configuration validation failed: {e}")
-            sys.exit(1)
-        
-        # Initialize LLM
-        langchain_config = settings.langchain_config
-        self.llm = ChatGoogleGenerativeAI(
-            model=langchain_config['model'],
-            google_api_key=settings.google_api_key,
-            temperature=langchain_config['temperature']
-        )
-        
-        # Initialize technical indicators client
-        self.indicators_client = TechnicalIndicatorsClient()
-        
-        # Initialize routing system
-        self.routing_enabled = True
-        self.routing_graph = None
-        
-        # Set up tools
-        self.tools = [
-            generate_rust_crypto_algo,
-            build_docker_image_only,
-            search_knowledge_base,
-            add_to_knowledge_base,
-            search_trading_strategies,
-            get_knowledge_base_stats,
-            get_mfi_analysis,
-            validate_stock_symbol,
-            get_technical_indicators,  # Legacy support
-        ]
-        
-        # Create prompt template and store system message
-        self.system_message = self._get_system_message()
-        self.prompt = self._create_prompt_template()
-        
-        # Create agent
-        self.agent = create_tool_calling_agent(
-            llm=self.llm,
-            tools=self.tools,
-            prompt=self.prompt
+
+# Exact-match response cache bounds: entries kept, history turns hashed
+# into each key so answers that depended on context don't leak across it
+_EXACT_CACHE_MAX = 1024
+_EXACT_CACHE_TURNS = 4
+
+
+def _max_history_tokens() -> int:
+    """Token budget for chat history sent to the model (0 disables)."""
+    try:
+        return int(os.getenv('AGENT_MAX_HISTORY_TOKENS', '8000'))
+    except ValueError:
+        return 8000
+
+
+# Prompt for collapsing the older half of an over-budget history
+_HISTORY_SUMMARY_PROMPT = (
+    "Summarize the following conversation between a user and a trading "
+    "assistant in at most 200 words. Keep every concrete fact: symbols, "
+    "strategy names, parameter values, project names and decisions.\n\n{turns}"
+)
+
+# Set by _load_heavy_imports; kept as a flag so repeated construction is cheap
+_HEAVY_IMPORTS_LOADED = False
+
+
+def _load_heavy_imports() -> None:
+    """Import LangChain / LangGraph / tool modules on first agent construction.
+
+    These imports cost hundreds of milliseconds and pull in the Google SDK and
+    service stacks transitively, so they are deferred until a FinanceAgent is
+    actually instantiated instead of taxing every `import agents.finance_agent`
+    (e.g. --help runs or management commands that never build an agent).
+    """
+    global _HEAVY_IMPORTS_LOADED
+    if _HEAVY_IMPORTS_LOADED:
+        return
+
+    global ChatGoogleGenerativeAI, create_tool_calling_agent, AgentExecutor
+    global ChatPromptTemplate, BaseMessage, HumanMessage, AIMessage, SystemMessage
+    global PlanAndExecute, parallel_executor_enabled
+    global SemanticResponseCache, semantic_cache_enabled
+    global generate_rust_crypto_algo, build_docker_image_only
+    global search_knowledge_base, add_to_knowledge_base, search_trading_strategies, get_knowledge_base_stats
+    global get_mfi_analysis, validate_stock_symbol, get_technical_indicators
+    global extract_symbols_from_text, build_indicators_context, abuild_indicators_context
+    global TechnicalIndicatorsClient
+
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from langchain.agents import create_tool_calling_agent, AgentExecutor
+    from langchain.prompts import ChatPromptTemplate
+    from langchain.schema import BaseMessage, HumanMessage, AIMessage, SystemMessage
+
+    from agents.parallel_executor import PlanAndExecute, parallel_executor_enabled
+    from agents.semantic_cache import SemanticResponseCache, semantic_cache_enabled
+    from tools.trading_tools import generate_rust_crypto_algo, build_docker_image_only
+    from tools.rag_tools import search_knowledge_base, add_to_knowledge_base, search_trading_strategies, get_knowledge_base_stats
+    from tools.technical_indicators_tool import (
+        get_mfi_analysis, validate_stock_symbol, get_technical_indicators,
+        extract_symbols_from_text, build_indicators_context, abuild_indicators_context
+    )
+    from tools.technical_indicators_client import TechnicalIndicatorsClient
+
+    _HEAVY_IMPORTS_LOADED = True
+
+
+def _context_cache_enabled() -> bool:
+    """Whether Gemini server-side context caching is enabled via environment."""
+    return os.getenv('AGENT_CONTEXT_CACHE', '').lower() in ('true', '1', 'yes', 'on')
+
+
+def _create_context_cache(model: str):
+    """Create a server-side cache holding the static system prompt.
+
+    Gemini then prefills the tool-catalog prefix once instead of
+    re-processing those tokens on every turn. Returns the cache name, or
+    None when the API/SDK does not support caching (short prompts, old
+    SDKs, unsupported models) - callers fall back to uncached requests.
+    """
+    try:
+        from google.generativeai import caching
+
+        cache = caching.CachedContent.create(
+            model=model,
+            system_instruction=_SYSTEM_MESSAGE,
+            ttl=3600
         )
-        
-        # Create agent executor
-        self.agent_executor = AgentExecutor(
-            agent=self.agent,
-            tools=self.tools,
-            verbose=langchain_config['verbose'],
-            handle_parsing_errors=True,
-            max_iterations=langchain_config['max_iterations']
+        logger.info(f"Gemini context cache created: {cache.name}")
+        return cache.name
+    except Exception as e:
+        logger.warning(f"Gemini context caching unavailable, sending full prompt: {e}")
+        return None
+
+
+@lru_cache(maxsize=4)
+def _shared_llm(model: str, temperature: float):
+    """Return a process-wide chat model client for (model, temperature).
+
+    Each ChatGoogleGenerativeAI instance owns its own transport channel, so
+    constructing one per agent repeats TLS setup and loses connection reuse.
+    Caching here means every FinanceAgent with the same config shares one
+    client and its underlying connection pool.
+    """
+    kwargs = {}
+    if _context_cache_enabled():
+        cached_content = _create_context_cache(model)
+        if cached_content is not None:
+            kwargs['cached_content'] = cached_content
+
+    return ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=settings.google_api_key,
+        temperature=temperature,
+        **kwargs
+    )
+
+
+@lru_cache(maxsize=1)
+def _build_agent_runtime() -> Dict:
+    """Build the stateless agent runtime once per process.
+
+    The executor, prompt, and tool list carry no per-session state, so a
+    single set serves every FinanceAgent; new instances only pay for their
+    chat-history deques instead of a full executor graph plus LLM client.
+    """
+    langchain_config = settings.langchain_config
+    llm = _shared_llm(langchain_config['model'], langchain_config['temperature'])
+
+    tools = [
+        generate_rust_crypto_algo,
+        build_docker_image_only,
+        search_knowledge_base,
+        add_to_knowledge_base,
+        search_trading_strategies,
+        get_knowledge_base_stats,
+        get_mfi_analysis,
+        validate_stock_symbol,
+        get_technical_indicators,  # Legacy support
+    ]
+
+    system_message = FinanceAgent._get_system_message()
+    prompt = FinanceAgent._create_prompt_template(system_message)
+
+    agent = create_tool_calling_agent(llm=llm, tools=tools, prompt=prompt)
+    agent_executor = AgentExecutor(
+        agent=agent,
+        tools=tools,
+        verbose=langchain_config['verbose'],
+        handle_parsing_errors=True,
+        max_iterations=langchain_config['max_iterations']
+    )
+
+    # Optionally wrap with the parallel DAG executor (same invoke/ainvoke
+    # contract, falls back to the sequential executor on planning failure)
+    if parallel_executor_enabled():
+        agent_executor = PlanAndExecute(
+            llm=llm,
+            tools=tools,
+            fallback_executor=agent_executor
         )
-        
-        # Initialize chat history
-        api_config = settings.api_config
-        self.max_chat_history = api_config['max_chat_history']
-        self.chat_history: List[BaseMessage] = []
-        
-        # Initialize routing graph
-        if self.routing_enabled:
-            self._build_routing_graph()
-    
-    def _get_system_message(self) -> str:
-        """Get the system message for the agent."""
-        return """You are a finance and crypto trading expert AI assistant with access to advanced code generation, Docker containerization, and knowledge base capabilities.
+        logger.info("Parallel plan-and-execute tool executor enabled")
+
+    return {
+        'llm': llm,
+        'tools': tools,
+        'system_message': system_message,
+        'prompt': prompt,
+        'agent': agent,
+        'agent_executor': agent_executor,
+    }
+
+
+# Agent system message, hoisted to module level so constructing an agent
+# never re-creates the ~2 KB literal
+_SYSTEM_MESSAGE = """You are a finance and crypto trading expert AI assistant with access to advanced code generation, Docker containerization, and knowledge base capabilities.
 
 ## Available Tools:
 
@@ -179,11 +278,169 @@ Use these when users ask about:
 - **Production Ready**: Generate algorithm → Build Docker image → Provide deployment commands
 
 Always ask about Docker containerization preferences and suggest knowledge base searches for related strategies. Focus on practical, deployable solutions with clear documentation."""
+
+
+# Focused system prompt for the technical-analysis routing node
+_TECH_SYSTEM_MESSAGE = """You are a technical analysis expert. Use the provided technical indicator data to give detailed analysis and trading recommendations. Focus on:
+        1. MFI interpretation (overbought >80, oversold <20)
+        2. Trading signals and recommendations
+        3. Risk management suggestions
+        4. Entry/exit points if applicable
+
+        Be specific and actionable in your advice."""
+
+
+@dataclass(slots=True)
+class AgentState:
+    """State for the LangGraph routing system.
+
+    A slotted dataclass instead of a TypedDict: attribute access skips the
+    per-lookup dict hashing the routing nodes would otherwise pay, and slots
+    drop the per-instance __dict__ entirely.
+    """
+    user_message: str
+    messages: List[BaseMessage] = field(default_factory=list)
+    query_type: Optional[str] = None
+    symbols: List[str] = field(default_factory=list)
+    technical_data: Optional[str] = None
+    route_taken: Optional[str] = None
+
+
+class FinanceAgentError(Exception):
+    """Exception raised when Finance Agent operations fail."""
+    pass
+
+
+class FinanceAgent:
+    """Unified Finance Agent with intelligent routing, RAG, code generation, Docker, and technical analysis capabilities."""
+
+    # All request-type keywords combined into one alternation with a named
+    # group per category: a single scan reports every matched category,
+    # Aho-Corasick style, instead of one pass per detector
+    _CATEGORY_RE = re.compile(
+        r'(?P<docker>\b(?:docker|container(?:ize)?|image|build docker)\b)'
+        r'|(?P<rag>\b(?:search|find|knowledge|strategy|algorithm|example)\b)'
+        r'|(?P<tech>\b(?:mfi|rsi|macd|technical|overbought|oversold)\b)',
+        re.IGNORECASE
+    )
+
+    # Route classifier fast path: clearly-keyworded queries are routed with
+    # one regex pass each instead of an LLM round-trip; the LLM only sees
+    # queries none of these match
+    _ROUTE_PATTERNS = {
+        "algorithm_generation": re.compile(r'\b(?:generate|create|build|algorithm|docker|rust|bot)\b', re.IGNORECASE),
+        "technical_analysis": re.compile(r'\b(?:mfi|rsi|macd|overbought|oversold|technical)\b', re.IGNORECASE),
+        "rag_search": re.compile(r'\b(?:search|find|strategy|example|knowledge)\b', re.IGNORECASE),
+    }
+
+    # Heuristics that gate the LLM symbol-extraction fallback: a message with
+    # no capital letters and no well-known company name will not yield symbols
+    _CAPITAL_RE = re.compile(r'[A-Z]')
+    _COMPANY_RE = re.compile(
+        r'\b(?:apple|microsoft|nvidia|tesla|amazon|google|meta|netflix)\b', re.IGNORECASE
+    )
+
+    # Follow-up phrasing that refers back to earlier turns; queries without
+    # any of these hints get an empty chat history in the executor prompt
+    _HISTORY_HINT_RE = re.compile(
+        r'\b(?:it|that|this|those|these|them|previous|earlier|before|again|'
+        r'last|above|same|continue|instead|other|also)\b',
+        re.IGNORECASE
+    )
+
+    # Bound on the per-instance symbol-extraction LRU cache
+    _SYMBOL_CACHE_SIZE = 2048
+
+    def __init__(self):
+        _load_heavy_imports()
+
+        # Validate settings; raising (rather than sys.exit) keeps embedded
+        # servers alive - a bad config fails this construction, not the worker
+        try:
+            settings.validate_required_settings()
+        except Exception as e:
+            raise FinanceAgentError(f"Configuration validation failed: {e}") from e
+        
+        # Shared stateless runtime: the LLM client, tools, prompt, and
+        # executor carry no per-session state, so every agent instance reuses
+        # the process-wide set and only allocates its own history below
+        runtime = _build_agent_runtime()
+        self.llm = runtime['llm']
+        self.tools = runtime['tools']
+        self.system_message = runtime['system_message']
+        self.prompt = runtime['prompt']
+        self.agent = runtime['agent']
+        self.agent_executor = runtime['agent_executor']
+        # Tool list is fixed after init, so extract the names once
+        self._tool_names: Tuple[str, ...] = tuple(tool.name for tool in self.tools)
+
+        # Constant prompt message built once; the node reuses it instead of
+        # re-running Pydantic message construction per request
+        self._tech_system_message = SystemMessage(content=_TECH_SYSTEM_MESSAGE)
+
+        # Initialize technical indicators client
+        self.indicators_client = TechnicalIndicatorsClient()
+
+        # Initialize routing system
+        self.routing_enabled = True
+        self.routing_graph = None
+
+        # Cap concurrent outbound LLM traffic: parallel calls still overlap,
+        # but a busy server cannot pile unbounded requests onto the provider
+        self._llm_sem = asyncio.Semaphore(settings.langchain_config['max_concurrent_llm'])
+
+        # Opt-in semantic response cache for near-duplicate queries
+        self._semantic_cache = SemanticResponseCache() if semantic_cache_enabled() else None
+
+        # Opt-in exact-match response cache (FINANCE_AGENT_CACHE=1):
+        # repeated identical queries under the same recent history skip
+        # the executor round-trip entirely
+        self._exact_cache: Optional[OrderedDict] = OrderedDict() if _exact_cache_enabled() else None
+
+        # LRU cache for LLM symbol-extraction results keyed by normalized input
+        self._symbol_cache: OrderedDict = OrderedDict()
+
+        # Initialize chat history (deque evicts the oldest turn in O(1))
+        api_config = settings.api_config
+        self.max_chat_history = api_config['max_chat_history']
+        self.chat_history: Deque[BaseMessage] = deque(maxlen=self.max_chat_history)
+        # Structure-of-arrays mirror of chat_history: two parallel deques of
+        # plain strings, already paired by turn, so history consumers read
+        # them directly without walking BaseMessage objects or re-pairing
+        # alternating entries
+        self._user_msgs: Deque[str] = deque(maxlen=self.max_chat_history // 2)
+        self._agent_msgs: Deque[str] = deque(maxlen=self.max_chat_history // 2)
+        
+        # Route dispatch table: the routing topology is a single fan-out, so
+        # a dict lookup dispatches straight to the node coroutine with none of
+        # LangGraph's per-invoke state plumbing
+        self._node_table = {
+            "algorithm_generation": self._algorithm_generation_node,
+            "technical_analysis": self._technical_analysis_node,
+            "rag_search": self._rag_search_node,
+            "mixed_analysis": self._mixed_analysis_node,
+            "general_agent": self._general_agent_node,
+        }
+
+        # The compiled LangGraph path is kept behind an env flag for debugging
+        if self.routing_enabled and _use_langgraph():
+            self._build_routing_graph()
     
-    def _create_prompt_template(self) -> ChatPromptTemplate:
-        """Create the system prompt template for the agent."""
+    @staticmethod
+    def _get_system_message() -> str:
+        """Get the system message for the agent."""
+        return _SYSTEM_MESSAGE
+    
+    @staticmethod
+    def _create_prompt_template(system_message: str) -> ChatPromptTemplate:
+        """Create the system prompt template for the agent.
+
+        The system message is baked in as a static tuple rather than injected
+        as a {system_message} variable, so the prompt prefix is byte-identical
+        across turns and server-side prefix caching can take effect.
+        """
         return ChatPromptTemplate.from_messages([
-            ("system", "{system_message}"),
+            ("system", system_message),
             ("placeholder", "{chat_history}"),
             ("human", "{input}"),
             ("placeholder", "{agent_scratchpad}")
@@ -192,75 +449,299 @@ Always ask about Docker containerization preferences and suggest knowledge base
     def process_message(self, user_input: str) -> str:
         """Process a user message and return the agent's response."""
         # Use intelligent routing by default if available
-        if self.routing_enabled and self.routing_graph:
+        if self.routing_enabled:
             return self.process_message_with_routing(user_input)
         
         # Fallback to traditional processing
         try:
             # Log detected request types
-            message_lower = user_input.lower()
-            if any(kw in message_lower for kw in ['docker', 'container', 'containerize', 'image', 'build docker']):
+            detected = {m.lastgroup for m in self._CATEGORY_RE.finditer(user_input)}
+            if 'docker' in detected:
                 print("[INFO] Detected Docker-related request")
-            
-            if any(kw in message_lower for kw in ['search', 'find', 'knowledge', 'strategy', 'algorithm', 'example']):
+
+            if 'rag' in detected:
                 print("[INFO] Detected potential knowledge base query")
-            
-            if any(kw in message_lower for kw in ['mfi', 'rsi', 'macd', 'technical', 'overbought', 'oversold']):
+
+            if 'tech' in detected:
                 print("[INFO] Detected technical analysis request")
                 
             symbols = extract_symbols_from_text(user_input)
             if symbols:
                 print(f"[INFO] Detected symbols: {', '.join(symbols)}")
-            
+
+            cache_key = None
+            if self._exact_cache is not None:
+                cache_key = self._exact_cache_key(user_input)
+                cached = self._exact_cache.get(cache_key)
+                if cached is not None:
+                    self._exact_cache.move_to_end(cache_key)
+                    logger.info("Exact-match response cache hit")
+                    self._record_turn(user_input, cached)
+                    return cached
+
             # Process with agent
             response = self.agent_executor.invoke({
                 "input": user_input,
-                "chat_history": self.chat_history,
-                "system_message": self.system_message
+                "chat_history": list(self.chat_history)
             })
             
             agent_response = response.get("output", "I couldn't generate a response.")
-            
-            # Update chat history
-            self.chat_history.append(HumanMessage(content=user_input))
-            self.chat_history.append(AIMessage(content=agent_response))
-            
-            # Trim chat history if too long
-            if len(self.chat_history) > self.max_chat_history:
-                self.chat_history = self.chat_history[-self.max_chat_history:]
-            
+
+            self._record_turn(user_input, agent_response)
+            if cache_key is not None:
+                self._exact_cache_store(cache_key, agent_response)
+
             return agent_response
-            
+
         except Exception as e:
             error_msg = f"An error occurred while processing your message: {str(e)}"
             print(f"[ERROR] {error_msg}")
             return error_msg
-    
+
+    async def aprocess_message(self, user_input: str) -> str:
+        """Async variant of process_message.
+
+        Awaits the agent executor instead of blocking on it, so concurrent
+        sessions (API mode) overlap LLM round-trips and tool I/O instead of
+        queueing behind a single thread.
+        """
+        await self._compress_history_if_needed()
+
+        cache_key = None
+        if self._exact_cache is not None:
+            cache_key = self._exact_cache_key(user_input)
+            cached = self._exact_cache.get(cache_key)
+            if cached is not None:
+                self._exact_cache.move_to_end(cache_key)
+                logger.info("Exact-match response cache hit")
+                self._record_turn(user_input, cached)
+                return cached
+
+        try:
+            response = await self._ainvoke_executor({
+                "input": user_input,
+                "chat_history": list(self.chat_history)
+            })
+
+            agent_response = response.get("output", "I couldn't generate a response.")
+
+            self._record_turn(user_input, agent_response)
+            if cache_key is not None:
+                self._exact_cache_store(cache_key, agent_response)
+
+            return agent_response
+
+        except Exception as e:
+            error_msg = f"An error occurred while processing your message: {str(e)}"
+            logger.error(error_msg)
+            return error_msg
+
+    async def astream_message(self, user_input: str):
+        """Stream the agent's response as it is generated.
+
+        Yields token chunks from the underlying chat model so callers can
+        render output at time-to-first-token instead of waiting for the full
+        decode. The completed response is recorded in chat history once the
+        stream finishes.
+        """
+        chunks = []
+        try:
+            async for event in self.agent_executor.astream_events(
+                {"input": user_input, "chat_history": list(self.chat_history)},
+                version="v2"
+            ):
+                if event["event"] == "on_chat_model_stream":
+                    content = event["data"]["chunk"].content
+                    if content:
+                        chunks.append(content)
+                        yield content
+        except Exception as e:
+            error_msg = f"An error occurred while processing your message: {str(e)}"
+            logger.error(error_msg)
+            yield error_msg
+            return
+
+        # Single join at stream end, then one history update
+        if chunks:
+            self._record_turn(user_input, "".join(chunks))
+
+    def _history_token_estimate(self) -> int:
+        """Cheap token estimate for the chat history (~4 chars per token).
+
+        Deliberately provider-free: Gemini's precise counter is a blocking
+        count_tokens HTTP call, so _compress_history_if_needed only
+        consults it when this estimate lands in the uncertain band around
+        the budget.
+        """
+        return sum(len(m.content) for m in self.chat_history) // 4
+
+    async def _compress_history_if_needed(self) -> None:
+        """Collapse the older half of the history when over the token budget.
+
+        Twenty short turns fit easily, but twenty code-generation turns
+        can blow past the context window; when the estimate exceeds
+        AGENT_MAX_HISTORY_TOKENS the oldest half is summarized into one
+        SystemMessage by a single flash call and the recent half stays
+        verbatim. On any failure the history is left untouched.
+        """
+        budget = _max_history_tokens()
+        if budget <= 0 or len(self.chat_history) < 4:
+            return
+
+        # Cheap chars/4 gate first: histories clearly under (or clearly
+        # over) the budget never touch the provider's token counter, which
+        # on Gemini is a network round-trip per check
+        estimate = self._history_token_estimate()
+        if estimate <= (budget * 3) // 4:
+            return
+        if estimate <= budget * 2:
+            # Uncertain band: get a precise count, on a worker thread so
+            # the blocking count_tokens call never stalls the event loop
+            try:
+                estimate = await asyncio.to_thread(
+                    self.llm.get_num_tokens_from_messages, list(self.chat_history)
+                )
+            except Exception:
+                pass  # transient counter failure: trust the estimate
+        if estimate <= budget:
+            return
+
+        messages = list(self.chat_history)
+        split = len(messages) // 2
+        old_turns = "\n".join(
+            f"{type(m).__name__}: {m.content}" for m in messages[:split]
+        )
+
+        try:
+            response = await self._ainvoke_llm([
+                HumanMessage(content=_HISTORY_SUMMARY_PROMPT.format(turns=old_turns))
+            ])
+        except Exception as e:
+            logger.warning(f"History compression failed, keeping full history: {e}")
+            return
+
+        summary = SystemMessage(
+            content=f"Summary of earlier conversation: {response.content}"
+        )
+        self.chat_history.clear()
+        self.chat_history.append(summary)
+        self.chat_history.extend(messages[split:])
+        logger.info(f"Compressed {split} history messages into a summary")
+
+    def _exact_cache_key(self, user_input: str) -> str:
+        """Hash the query together with the recent history it runs under."""
+        digest = hashlib.sha256(user_input.encode())
+        for msg in islice(reversed(self._user_msgs), _EXACT_CACHE_TURNS):
+            digest.update(b'\x00u')
+            digest.update(msg.encode())
+        for msg in islice(reversed(self._agent_msgs), _EXACT_CACHE_TURNS):
+            digest.update(b'\x00a')
+            digest.update(msg.encode())
+        return digest.hexdigest()
+
+    def _exact_cache_store(self, key: str, response: str) -> None:
+        """Insert a response, evicting the least recently used entry."""
+        cache = self._exact_cache
+        cache[key] = response
+        cache.move_to_end(key)
+        if len(cache) > _EXACT_CACHE_MAX:
+            cache.popitem(last=False)
+
+    async def _ainvoke_llm(self, messages):
+        """Call the chat model under the shared concurrency cap."""
+        async with self._llm_sem:
+            return await self.llm.ainvoke(messages)
+
+    async def _ainvoke_executor(self, payload: Dict) -> Dict:
+        """Run the agent executor under the shared concurrency cap."""
+        async with self._llm_sem:
+            return await self.agent_executor.ainvoke(payload)
+
+    def _record_turn(self, user_input: str, agent_response: str,
+                     message_pair: Optional[Tuple[BaseMessage, BaseMessage]] = None) -> None:
+        """Append a completed user/agent turn to the chat history.
+
+        The deque's maxlen handles trimming, so no copy is made on overflow.
+        The plain-string mirrors evict whole turns in lockstep with the
+        message deque. Callers that already hold the constructed message
+        objects (the routing path threads them through the state) pass them
+        in to avoid a rebuild.
+        """
+        if message_pair is None:
+            message_pair = (HumanMessage(content=user_input), AIMessage(content=agent_response))
+        self.chat_history.extend(message_pair)
+        self._user_msgs.append(user_input)
+        self._agent_msgs.append(agent_response)
+
+    @property
+    def user_msgs(self) -> Deque[str]:
+        """User messages, one entry per completed turn (parallel to agent_msgs)."""
+        return self._user_msgs
+
+    @property
+    def agent_msgs(self) -> Deque[str]:
+        """Agent responses, one entry per completed turn (parallel to user_msgs)."""
+        return self._agent_msgs
+
+    @property
+    def serialized_history(self) -> List[Dict]:
+        """Chat history in dict form for API/wire consumers."""
+        history = []
+        for user_msg, agent_msg in zip(self._user_msgs, self._agent_msgs):
+            history.append({"role": "user", "content": user_msg})
+            history.append({"role": "model", "content": agent_msg})
+        return history
+
+    def _recent_history(self, n: int = 5) -> List[BaseMessage]:
+        """Return the last n history messages as a list for the executor."""
+        return list(islice(self.chat_history, max(0, len(self.chat_history) - n), None))
+
+    def _needs_history(self, user_message: str) -> bool:
+        """Whether a query likely refers back to earlier turns.
+
+        Self-contained requests ("generate a simple RSI bot") gain nothing
+        from prior messages, so skipping them keeps those tokens out of the
+        prompt. Short messages and ones with referential phrasing ("do that
+        again", "what about it") keep the history.
+        """
+        if len(user_message.split()) <= 3:
+            return True
+        return self._HISTORY_HINT_RE.search(user_message) is not None
+
+    def _node_history(self, user_message: str) -> List[BaseMessage]:
+        """History payload for a routing node: recent turns or nothing."""
+        if self._needs_history(user_message):
+            return self._recent_history(5)
+        return []
+
     def display_chat_history(self) -> None:
-        """Print the current chat history."""
-        print("\\n--- Chat History ---")
-        for message in self.chat_history:
-            if isinstance(message, HumanMessage):
-                print(f"You: {message.content}")
-            elif isinstance(message, AIMessage):
-                print(f"Agent: {message.content}")
-        print("--------------------\\n")
+        """Print the current chat history with a single stdout write."""
+        lines = ["\\n--- Chat History ---"]
+        lines.extend(
+            ("You: " if isinstance(message, HumanMessage) else "Agent: ") + message.content
+            for message in self.chat_history
+            if isinstance(message, (HumanMessage, AIMessage))
+        )
+        lines.append("--------------------\\n")
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def clear_history(self) -> None:
         """Clear the chat history."""
-        self.chat_history = []
-    
-    def get_available_tools(self) -> List[str]:
-        """Get list of available tool names."""
-        return [tool.name for tool in self.tools]
+        self.chat_history.clear()
+        self._user_msgs.clear()
+        self._agent_msgs.clear()
     
+    def get_available_tools(self) -> Tuple[str, ...]:
+        """Get the available tool names (precomputed at init)."""
+        return self._tool_names
+
     def get_agent_stats(self) -> dict:
         """Get statistics about the agent."""
         return {
             "chat_history_length": len(self.chat_history),
             "max_chat_history": self.max_chat_history,
-            "available_tools": len(self.tools),
-            "tool_names": self.get_available_tools(),
+            "available_tools": len(self._tool_names),
+            "tool_names": self._tool_names,
             "llm_model": settings.langchain_config['model'],
             "agent_initialized": True,
             "routing_enabled": self.routing_enabled
@@ -268,10 +749,16 @@ Always ask about Docker containerization preferences and suggest knowledge base
     
     # ===== ROUTING SYSTEM METHODS =====
     
-    def _route_query(self, state: AgentState) -> Literal["algorithm_generation", "technical_analysis", "rag_search", "general_agent", "mixed_analysis"]:
-        """Route user queries based on content using LLM classification"""
-        user_message = state["user_message"]
-        
+    async def _route_query(self, state: AgentState) -> Literal["algorithm_generation", "technical_analysis", "rag_search", "general_agent", "mixed_analysis"]:
+        """Route user queries based on content, using the LLM only for ambiguous cases"""
+        user_message = state.user_message
+
+        # Fast path: a single keyword-pattern hit settles the route without
+        # spending a network round-trip; multiple hits mean a mixed request
+        fast_route = self._route_fast_path(user_message)
+        if fast_route is not None:
+            return fast_route
+
         routing_prompt = f"""
         Classify the following user query into one of these categories:
         
@@ -287,7 +774,7 @@ Always ask about Docker containerization preferences and suggest knowledge base
         """
         
         try:
-            response = self.llm.invoke([HumanMessage(content=routing_prompt)])
+            response = await self._ainvoke_llm([HumanMessage(content=routing_prompt)])
             route = response.content.strip().lower()
             
             # Validate the route
@@ -311,7 +798,7 @@ Always ask about Docker containerization preferences and suggest knowledge base
             logger.error(f"Error in query routing: {e}")
             return "general_agent"
     
-    def _extract_symbols(self, text: str) -> List[str]:
+    async def _extract_symbols(self, text: str) -> List[str]:
         """Extract stock symbols from text using both regex and LLM"""
         if not text.strip():
             return []
@@ -320,7 +807,19 @@ Always ask about Docker containerization preferences and suggest knowledge base
         regex_symbols = extract_symbols_from_text(text)
         if regex_symbols:
             return regex_symbols
-        
+
+        # No capitalized token and no known company name: the LLM would
+        # almost certainly answer NONE, so skip the round-trip entirely
+        if not self._CAPITAL_RE.search(text) and not self._COMPANY_RE.search(text):
+            return []
+
+        # Repeats are free: check the LRU cache before calling the LLM
+        cache_key = text.strip().lower()
+        cached = self._symbol_cache.get(cache_key)
+        if cached is not None:
+            self._symbol_cache.move_to_end(cache_key)
+            return list(cached)
+
         # If no symbols found, try LLM extraction for company names
         extraction_prompt = f"""
         Analyze the following text and extract all stock symbols and company references. 
@@ -344,132 +843,214 @@ Always ask about Docker containerization preferences and suggest knowledge base
         """
         
         try:
-            response = self.llm.invoke([HumanMessage(content=extraction_prompt)])
+            response = await self._ainvoke_llm([HumanMessage(content=extraction_prompt)])
             result = response.content.strip()
-            
+
             if result == "NONE" or not result:
+                self._cache_symbols(cache_key, ())
                 return []
-            
-            # Parse the response
-            symbols = [symbol.strip().upper() for symbol in result.split(',')]
-            
-            # Filter out invalid symbols (basic validation)
-            valid_symbols = []
-            for symbol in symbols:
-                # Remove any non-alphabetic characters and validate length
-                clean_symbol = re.sub(r'[^A-Z]', '', symbol)
-                if 1 <= len(clean_symbol) <= 5:
-                    valid_symbols.append(clean_symbol)
-            
-            return list(set(valid_symbols))  # Remove duplicates
-            
+
+            # Comma-split first, then fullmatch each token against the
+            # precompiled pattern: a non-conforming reply ("The symbols
+            # are AAPL") yields no tokens instead of treating every short
+            # word in the prose as a ticker
+            unique_symbols = list({
+                token for token in (part.strip().upper() for part in result.split(','))
+                if _SYMBOL_TOKEN.fullmatch(token)
+            })
+            self._cache_symbols(cache_key, tuple(unique_symbols))
+            return unique_symbols
+
         except Exception as e:
             logger.error(f"Error in LLM symbol extraction: {e}")
             return []
+
+    def _cache_symbols(self, cache_key: str, symbols: Tuple[str, ...]) -> None:
+        """Store an LLM extraction result, evicting the oldest entry when full."""
+        self._symbol_cache[cache_key] = symbols
+        self._symbol_cache.move_to_end(cache_key)
+        if len(self._symbol_cache) > self._SYMBOL_CACHE_SIZE:
+            self._symbol_cache.popitem(last=False)
     
-    def _prepare_state(self, state: AgentState) -> AgentState:
-        """Extract symbols and set up initial state"""
-        symbols = self._extract_symbols(state["user_message"])
-        state["symbols"] = symbols
+    def _route_fast_path(self, user_message: str) -> Optional[str]:
+        """Keyword-based route decision; None when no pattern matches."""
+        hits = [route for route, pattern in self._ROUTE_PATTERNS.items()
+                if pattern.search(user_message)]
+        if len(hits) == 1:
+            return hits[0]
+        if len(hits) > 1:
+            return "mixed_analysis"
+        return None
+
+    async def _route_and_symbols(self, user_message: str) -> Optional[Tuple[str, List[str]]]:
+        """Classify the route and extract symbols in ONE LLM call.
+
+        Returns None when the reply is not usable JSON, in which case the
+        caller falls back to the two-call path.
+        """
+        combined_prompt = f"""
+        Analyze the user query below and respond with a JSON object only, no prose:
+        {{"route": "<category>", "symbols": ["<stock ticker symbols mentioned or implied>"]}}
+
+        Categories:
+        1. "algorithm_generation" - User asks to create algorithms, generate code, build Docker images, or create trading bots
+        2. "technical_analysis" - User asks about technical indicators (MFI, RSI, MACD), stock analysis, or mentions specific symbols
+        3. "rag_search" - User asks to search for strategies, find examples, or needs knowledge base information
+        4. "mixed_analysis" - User asks about both technical analysis AND algorithm generation or strategy searches
+        5. "general_agent" - General trading questions, explanations, or requests that don't fit other categories
+
+        Use an empty "symbols" list when no stocks are mentioned.
+
+        User query: "{user_message}"
+        """
+
+        try:
+            response = await self._ainvoke_llm([HumanMessage(content=combined_prompt)])
+            text = response.content.strip()
+            if text.startswith("```"):
+                text = re.sub(r'^```(?:json)?\s*|\s*```$', '', text)
+
+            data = json.loads(text)
+            route = str(data.get("route", "")).strip().lower()
+            raw_symbols = data.get("symbols", [])
+            if route not in self._node_table or not isinstance(raw_symbols, list):
+                return None
+
+            # Same fail-closed parse as _extract_symbols: each list item
+            # must be a ticker on its own, not prose containing short words
+            symbols = list({token for token in
+                            (str(sym).strip().upper() for sym in raw_symbols)
+                            if _SYMBOL_TOKEN.fullmatch(token)})
+            return route, symbols
+
+        except Exception as e:
+            logger.warning(f"Combined route/symbol classification failed: {e}")
+            return None
+
+    async def _prepare_state(self, state: AgentState) -> AgentState:
+        """Classify the query and extract symbols with minimal LLM traffic.
+
+        The free checks run first (keyword route, regex symbols). When both
+        would otherwise need the LLM, one combined JSON call replaces the
+        two separate round-trips; a malformed reply falls back to the
+        original two-call path run concurrently.
+        """
+        user_message = state.user_message
+
+        # Build the user message object exactly once; the routing nodes
+        # append only their AIMessage instead of rebuilding the pair
+        state.messages = [HumanMessage(content=user_message)]
+
+        fast_route = self._route_fast_path(user_message)
+        regex_symbols = extract_symbols_from_text(user_message)
+
+        if fast_route is not None:
+            state.query_type = fast_route
+            state.symbols = regex_symbols or await self._extract_symbols(user_message)
+            return state
+
+        combined = await self._route_and_symbols(user_message)
+        if combined is not None:
+            route, llm_symbols = combined
+            state.query_type = route
+            state.symbols = regex_symbols or llm_symbols
+            return state
+
+        # Structured concurrency: both classification calls run in parallel,
+        # and a failure in either cancels the other instead of leaking it
+        async with asyncio.TaskGroup() as tg:
+            route_task = tg.create_task(self._route_query(state))
+            symbols_task = tg.create_task(self._extract_symbols(user_message))
+        state.query_type = route_task.result()
+        state.symbols = symbols_task.result()
         return state
     
-    def _algorithm_generation_node(self, state: AgentState) -> AgentState:
+    async def _algorithm_generation_node(self, state: AgentState) -> AgentState:
         """Handle algorithm generation and Docker requests using existing tools"""
-        user_message = state["user_message"]
+        user_message = state.user_message
         
         # Add context about available algorithms if symbols were mentioned
-        symbols = state["symbols"]
+        symbols = state.symbols
         context = ""
         if symbols:
             context = f"\n\nNote: User mentioned symbols: {', '.join(symbols)}. Consider incorporating these in the algorithm."
         
         # Use the existing agent executor for algorithm generation
         try:
-            response = self.agent_executor.invoke({
+            response = await self._ainvoke_executor({
                 "input": user_message + context,
-                "chat_history": self.chat_history[-5:],  # Limited history for context
-                "system_message": self.system_message
+                "chat_history": self._node_history(user_message)  # Only when contextual
             })
             
             agent_response = response.get("output", "I couldn't generate a response.")
-            state["messages"] = [HumanMessage(content=user_message), AIMessage(content=agent_response)]
-            state["route_taken"] = "algorithm_generation"
+            state.messages.append(AIMessage(content=agent_response))
+            state.route_taken = "algorithm_generation"
             
         except Exception as e:
             error_msg = f"Error in algorithm generation: {str(e)}"
-            state["messages"] = [HumanMessage(content=user_message), AIMessage(content=error_msg)]
-            state["route_taken"] = "algorithm_generation"
+            state.messages.append(AIMessage(content=error_msg))
+            state.route_taken = "algorithm_generation"
         
         return state
     
-    def _technical_analysis_node(self, state: AgentState) -> AgentState:
+    async def _technical_analysis_node(self, state: AgentState) -> AgentState:
         """Handle technical analysis requests"""
-        symbols = state["symbols"]
-        user_message = state["user_message"]
+        symbols = state.symbols
+        user_message = state.user_message
         
-        # Build technical context
-        technical_data = build_indicators_context(symbols)
-        state["technical_data"] = technical_data
+        # Build technical context (symbols fetched concurrently)
+        technical_data = await abuild_indicators_context(symbols)
+        state.technical_data = technical_data
         
         enhanced_message = user_message
         if technical_data:
             enhanced_message += f"\n\nRelevant technical data:{technical_data}"
         
-        # Create focused technical analysis prompt
-        tech_system_msg = """You are a technical analysis expert. Use the provided technical indicator data to give detailed analysis and trading recommendations. Focus on:
-        1. MFI interpretation (overbought >80, oversold <20)
-        2. Trading signals and recommendations
-        3. Risk management suggestions
-        4. Entry/exit points if applicable
-        
-        Be specific and actionable in your advice."""
-        
-        messages = [SystemMessage(content=tech_system_msg)]
-        messages.append(HumanMessage(content=enhanced_message))
+        # Focused technical analysis prompt (system message prebuilt in __init__)
+        messages = [self._tech_system_message, HumanMessage(content=enhanced_message)]
         
         try:
-            response = self.llm.invoke(messages)
-            state["messages"] = [HumanMessage(content=user_message), AIMessage(content=response.content)]
-            state["route_taken"] = "technical_analysis"
+            response = await self._ainvoke_llm(messages)
+            state.messages.append(AIMessage(content=response.content))
+            state.route_taken = "technical_analysis"
         except Exception as e:
             error_msg = f"Error in technical analysis: {str(e)}"
-            state["messages"] = [HumanMessage(content=user_message), AIMessage(content=error_msg)]
-            state["route_taken"] = "technical_analysis"
+            state.messages.append(AIMessage(content=error_msg))
+            state.route_taken = "technical_analysis"
         
         return state
     
-    def _rag_search_node(self, state: AgentState) -> AgentState:
+    async def _rag_search_node(self, state: AgentState) -> AgentState:
         """Handle RAG and knowledge base searches"""
-        user_message = state["user_message"]
+        user_message = state.user_message
         
         # Use existing agent executor with focus on RAG tools
         try:
             rag_context = "Focus on using search_knowledge_base and search_trading_strategies tools to find relevant information."
-            response = self.agent_executor.invoke({
+            response = await self._ainvoke_executor({
                 "input": user_message + f"\n\n{rag_context}",
-                "chat_history": self.chat_history[-5:],
-                "system_message": self.system_message
+                "chat_history": self._node_history(user_message)
             })
             
             agent_response = response.get("output", "I couldn't find relevant information.")
-            state["messages"] = [HumanMessage(content=user_message), AIMessage(content=agent_response)]
-            state["route_taken"] = "rag_search"
+            state.messages.append(AIMessage(content=agent_response))
+            state.route_taken = "rag_search"
             
         except Exception as e:
             error_msg = f"Error in knowledge search: {str(e)}"
-            state["messages"] = [HumanMessage(content=user_message), AIMessage(content=error_msg)]
-            state["route_taken"] = "rag_search"
+            state.messages.append(AIMessage(content=error_msg))
+            state.route_taken = "rag_search"
         
         return state
     
-    def _mixed_analysis_node(self, state: AgentState) -> AgentState:
+    async def _mixed_analysis_node(self, state: AgentState) -> AgentState:
         """Handle requests requiring both technical analysis and other capabilities"""
-        symbols = state["symbols"]
-        user_message = state["user_message"]
+        symbols = state.symbols
+        user_message = state.user_message
         
-        # Get technical data first
-        technical_data = build_indicators_context(symbols)
-        state["technical_data"] = technical_data
+        # Get technical data first (symbols fetched concurrently)
+        technical_data = await abuild_indicators_context(symbols)
+        state.technical_data = technical_data
         
         # Enhance message with technical context
         enhanced_message = user_message
@@ -478,48 +1059,50 @@ Always ask about Docker containerization preferences and suggest knowledge base
         
         # Use full agent capabilities
         try:
-            response = self.agent_executor.invoke({
+            response = await self._ainvoke_executor({
                 "input": enhanced_message,
-                "chat_history": self.chat_history[-5:],
-                "system_message": self.system_message
+                "chat_history": self._node_history(user_message)
             })
             
             agent_response = response.get("output", "I couldn't generate a comprehensive response.")
-            state["messages"] = [HumanMessage(content=user_message), AIMessage(content=agent_response)]
-            state["route_taken"] = "mixed_analysis"
+            state.messages.append(AIMessage(content=agent_response))
+            state.route_taken = "mixed_analysis"
             
         except Exception as e:
             error_msg = f"Error in mixed analysis: {str(e)}"
-            state["messages"] = [HumanMessage(content=user_message), AIMessage(content=error_msg)]
-            state["route_taken"] = "mixed_analysis"
+            state.messages.append(AIMessage(content=error_msg))
+            state.route_taken = "mixed_analysis"
         
         return state
     
-    def _general_agent_node(self, state: AgentState) -> AgentState:
+    async def _general_agent_node(self, state: AgentState) -> AgentState:
         """Handle general questions using the full agent"""
-        user_message = state["user_message"]
-        
+        user_message = state.user_message
+
         try:
-            response = self.agent_executor.invoke({
+            response = await self._ainvoke_executor({
                 "input": user_message,
-                "chat_history": self.chat_history[-5:],
-                "system_message": self.system_message
+                "chat_history": self._node_history(user_message)
             })
             
             agent_response = response.get("output", "I couldn't generate a response.")
-            state["messages"] = [HumanMessage(content=user_message), AIMessage(content=agent_response)]
-            state["route_taken"] = "general_agent"
+            state.messages.append(AIMessage(content=agent_response))
+            state.route_taken = "general_agent"
             
         except Exception as e:
             error_msg = f"Error processing request: {str(e)}"
-            state["messages"] = [HumanMessage(content=user_message), AIMessage(content=error_msg)]
-            state["route_taken"] = "general_agent"
+            state.messages.append(AIMessage(content=error_msg))
+            state.route_taken = "general_agent"
         
         return state
     
     def _build_routing_graph(self) -> None:
         """Build the LangGraph workflow for intelligent routing"""
         try:
+            # langgraph is only needed when the graph path is enabled, so
+            # default runs never pay for its import
+            from langgraph.graph import StateGraph, START, END
+
             workflow = StateGraph(AgentState)
             
             # Add nodes
@@ -532,9 +1115,11 @@ Always ask about Docker containerization preferences and suggest knowledge base
             
             # Add edges
             workflow.add_edge(START, "prepare")
+            # Route was already decided inside _prepare_state, so the edge is
+            # a pure dict lookup rather than another LLM call
             workflow.add_conditional_edges(
                 "prepare",
-                self._route_query,
+                lambda state: state.query_type,
                 {
                     "algorithm_generation": "algorithm_generation",
                     "technical_analysis": "technical_analysis",
@@ -558,13 +1143,51 @@ Always ask about Docker containerization preferences and suggest knowledge base
             logger.error(f"Failed to build routing graph: {e}")
             self.routing_enabled = False
     
+    @staticmethod
+    def _run_coro_blocking(coro):
+        """Run a coroutine to completion from synchronous code.
+
+        Uses asyncio.run when no loop is running; inside a running loop
+        (e.g. a sync call made from async server code), the coroutine is run
+        on a short-lived worker thread instead of deadlocking.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
+
     def process_message_with_routing(self, user_input: str) -> str:
         """Process a user message using the intelligent routing system"""
-        if not self.routing_enabled or not self.routing_graph:
+        return self._run_coro_blocking(self.aprocess_message_with_routing(user_input))
+
+    async def aprocess_message_with_routing(self, user_input: str) -> str:
+        """Async entry point for the intelligent routing system.
+
+        The routing graph's nodes are all coroutines, so the event loop is
+        free during every LLM and indicator round-trip and concurrent
+        sessions interleave instead of queueing.
+        """
+        if not self.routing_enabled:
             # Fallback to standard processing
-            return self.process_message(user_input)
-        
+            return await self.aprocess_message(user_input)
+
+        await self._compress_history_if_needed()
+
         try:
+            # Semantic cache hit: skip the whole graph (embedding runs on a
+            # worker thread so the loop stays free). Inside the guarded
+            # block so a cache failure degrades to the normal path instead
+            # of failing the request.
+            if self._semantic_cache is not None:
+                cached = await asyncio.to_thread(self._semantic_cache.get, user_input)
+                if cached is not None:
+                    response, _route = cached
+                    self._record_turn(user_input, response)
+                    return response
+
             # Prepare initial state
             initial_state = AgentState(
                 messages=[],
@@ -574,32 +1197,44 @@ Always ask about Docker containerization preferences and suggest knowledge base
                 user_message=user_input,
                 route_taken=None
             )
-            
-            # Run the workflow
-            result = self.routing_graph.invoke(initial_state)
-            
+
+            # Run the workflow: direct dispatch by default, the compiled
+            # LangGraph only when AGENT_USE_LANGGRAPH is set
+            if self.routing_graph is not None:
+                result = await self.routing_graph.ainvoke(initial_state)
+                # LangGraph returns plain dicts even for dataclass schemas
+                if isinstance(result, dict):
+                    result = AgentState(**result)
+            else:
+                state = await self._prepare_state(initial_state)
+                node = self._node_table.get(state.query_type, self._general_agent_node)
+                result = await node(state)
+
             # Extract the response
-            if result["messages"] and len(result["messages"]) > 0:
-                last_message = result["messages"][-1]
+            if result.messages and len(result.messages) > 0:
+                last_message = result.messages[-1]
                 if isinstance(last_message, AIMessage):
                     response = last_message.content
                     
                     # Log routing information
-                    route_taken = result.get("route_taken", "unknown")
-                    symbols_found = result.get("symbols", [])
+                    route_taken = result.route_taken or "unknown"
+                    symbols_found = result.symbols
                     
                     logger.info(f"Query routed to: {route_taken}")
                     if symbols_found:
                         logger.info(f"Symbols extracted: {', '.join(symbols_found)}")
-                    
-                    # Update chat history
-                    self.chat_history.append(HumanMessage(content=user_input))
-                    self.chat_history.append(AIMessage(content=response))
-                    
-                    # Trim chat history if too long
-                    if len(self.chat_history) > self.max_chat_history:
-                        self.chat_history = self.chat_history[-self.max_chat_history:]
-                    
+
+                    if self._semantic_cache is not None:
+                        await asyncio.to_thread(
+                            self._semantic_cache.put, user_input, response, route_taken
+                        )
+
+                    # Messages were already built in the state; no rebuild
+                    self._record_turn(
+                        user_input, response,
+                        message_pair=(result.messages[0], last_message)
+                    )
+
                     return response
             
             return "I apologize, but I couldn't generate a response. Please try again."
@@ -607,7 +1242,7 @@ Always ask about Docker containerization preferences and suggest knowledge base
         except Exception as e:
             logger.error(f"Error in routing workflow: {e}")
             # Fallback to standard processing
-            return self.process_message(user_input)
+            return await self.aprocess_message(user_input)
     
     def toggle_routing(self, enabled: bool = None) -> bool:
         """Enable or disable intelligent routing"""
@@ -616,7 +1251,7 @@ Always ask about Docker containerization preferences and suggest knowledge base
         else:
             self.routing_enabled = enabled
         
-        if self.routing_enabled and not self.routing_graph:
+        if self.routing_enabled and _use_langgraph() and not self.routing_graph:
             self._build_routing_graph()
-        
+
         return self.routing_enabled
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""LLMCompiler-style planner that dispatches independent tool calls concurrently."""
+
+import asyncio
+import difflib
+import json
+import logging
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from langchain.schema import HumanMessage
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Matches $task1 / ${task2} placeholders used to reference upstream results
+_TASK_REF_RE = re.compile(r'\$\{?task(\d+)\}?')
+
+# Queries that almost always follow the "search patterns -> generate algorithm"
+# workflow from the system prompt; used to pre-dispatch codegen speculatively
+_SPECULATIVE_CODEGEN_RE = re.compile(
+    r'\b(?:generate|create|build|make|develop)\b.*\b(?:algorithm|strategy|bot)\b',
+    re.IGNORECASE
+)
+
+# Minimum arg similarity for committing a speculative result instead of
+# discarding it in favor of the planner's actual tool call
+_SPECULATION_SIMILARITY_THRESHOLD = 0.6
+
+# Locates the project path in generate_rust_crypto_algo's success message,
+# used to remove project trees written by discarded speculation
+_PROJECT_LOCATION_RE = re.compile(r'Project Location: (.+)')
+
+
+def _discard_speculative_output(task: "asyncio.Task") -> None:
+    """Remove the project tree a discarded speculative codegen wrote.
+
+    Runs as a done callback: cancellation cannot stop the sync tool on its
+    executor thread, so the task is allowed to settle and any project it
+    created on disk is deleted, keeping discarded speculation out of the
+    /projects listing. Only paths under the configured output root are
+    touched.
+    """
+    if task.cancelled() or task.exception() is not None:
+        return
+
+    match = _PROJECT_LOCATION_RE.search(str(task.result()))
+    if not match:
+        return
+
+    target = Path(match.group(1).strip()).resolve()
+    root = Path(settings.paths['generated_algorithms']).resolve()
+    if root in target.parents:
+        shutil.rmtree(target, ignore_errors=True)
+        logger.info(f"Removed discarded speculative project: {target}")
+
+_PLANNER_PROMPT = """You are a planner that decomposes a user request into tool calls.
+
+Available tools:
+{tool_descriptions}
+
+For the user request below, emit a JSON object of the form:
+{{"tasks": [{{"id": 1, "tool": "<tool name>", "args": {{...}}, "deps": []}}, ...]}}
+
+Rules:
+- Only use the listed tools.
+- "deps" lists the ids of tasks whose output this task needs.
+- If a task argument needs an upstream result, reference it as "$taskN".
+- Emit an empty task list if no tool is needed.
+- Respond with the JSON object only, no prose.
+
+User request: "{user_input}"
+"""
+
+
+class PlanningError(Exception):
+    """Exception raised when the planner output cannot be executed."""
+    pass
+
+
+class PlanAndExecute:
+    """Executes LLM-planned tool-call DAGs, running independent nodes concurrently.
+
+    The planner LLM is called once to produce a task DAG; each "ready frontier"
+    of tasks (all dependencies resolved) is dispatched with asyncio.gather, so
+    wall time for k independent tool calls approaches max(latency) instead of
+    sum(latency). Exposes the same invoke/ainvoke contract as AgentExecutor.
+    """
+
+    def __init__(self, llm, tools: List[Any], fallback_executor=None):
+        self.llm = llm
+        self.tools = {tool.name: tool for tool in tools}
+        self.fallback_executor = fallback_executor
+
+    def invoke(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Synchronous entry point matching AgentExecutor.invoke."""
+        return asyncio.run(self.ainvoke(payload))
+
+    async def ainvoke(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Plan the request into a tool DAG and execute it concurrently."""
+        user_input = payload.get("input", "")
+
+        # Speculatively start codegen while the planner LLM is still deciding,
+        # hiding the planner's decode latency for the common workflow
+        speculative = self._start_speculation(user_input)
+
+        try:
+            tasks = await self._plan(user_input)
+        except PlanningError as e:
+            self._cancel_speculation(speculative)
+            logger.warning(f"Planner output unusable ({e}), falling back to sequential executor")
+            return await self._fallback(payload)
+
+        if not tasks:
+            self._cancel_speculation(speculative)
+            return await self._fallback(payload)
+
+        try:
+            results = await self._execute_dag(tasks, speculative)
+        except PlanningError as e:
+            self._cancel_speculation(speculative)
+            logger.warning(f"DAG execution failed ({e}), falling back to sequential executor")
+            return await self._fallback(payload)
+
+        output = "\n\n".join(str(results[task_id]) for task_id in sorted(results))
+        return {"output": output}
+
+    def _start_speculation(self, user_input: str) -> Optional[Dict[str, Any]]:
+        """Pre-dispatch generate_rust_crypto_algo when the query clearly wants codegen.
+
+        The system prompt steers the agent into "search existing patterns ->
+        generate custom algorithm", so the codegen call is launched in
+        parallel with planning and committed only if the planner agrees.
+        """
+        tool = self.tools.get('generate_rust_crypto_algo')
+        if tool is None or not _SPECULATIVE_CODEGEN_RE.search(user_input):
+            return None
+
+        args = {"algo_description": user_input, "build_docker": False}
+        logger.info("Speculatively dispatching generate_rust_crypto_algo")
+        return {
+            "tool": 'generate_rust_crypto_algo',
+            "args": args,
+            "task": asyncio.ensure_future(tool.ainvoke(args)),
+            "committed": False,
+            "discarded": False
+        }
+
+    def _cancel_speculation(self, speculative: Optional[Dict[str, Any]]) -> None:
+        """Discard an uncommitted speculative task and undo its side effects.
+
+        The sync tool runs on an executor thread that task cancellation
+        cannot reach, so rather than cancelling (which would also lose the
+        result needed for cleanup) the task is left to settle and a done
+        callback deletes the project tree it wrote.
+        """
+        if speculative is None or speculative["committed"] or speculative["discarded"]:
+            return
+        speculative["discarded"] = True
+        speculative["task"].add_done_callback(_discard_speculative_output)
+
+    def _match_speculation(self, speculative: Optional[Dict[str, Any]],
+                           task: Dict[str, Any], args: Dict[str, Any]) -> bool:
+        """Whether a planned task is close enough to commit the speculated one."""
+        if speculative is None or task["tool"] != speculative["tool"]:
+            return False
+
+        planned = str(args.get("algo_description", ""))
+        speculated = str(speculative["args"].get("algo_description", ""))
+        similarity = difflib.SequenceMatcher(None, planned.lower(), speculated.lower()).ratio()
+        return similarity >= _SPECULATION_SIMILARITY_THRESHOLD
+
+    async def _plan(self, user_input: str) -> List[Dict[str, Any]]:
+        """Call the planner LLM once and parse the task DAG."""
+        tool_descriptions = "\n".join(
+            f"- {name}: {tool.description.strip().splitlines()[0]}"
+            for name, tool in self.tools.items()
+        )
+        prompt = _PLANNER_PROMPT.format(
+            tool_descriptions=tool_descriptions,
+            user_input=user_input
+        )
+
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        return self._parse_plan(response.content)
+
+    def _parse_plan(self, content: str) -> List[Dict[str, Any]]:
+        """Parse and validate the planner's JSON task list."""
+        # Strip markdown fences if the model wrapped the JSON
+        text = content.strip()
+        if text.startswith("```"):
+            text = re.sub(r'^```(?:json)?\s*|\s*```$', '', text)
+
+        try:
+            plan = json.loads(text)
+        except (ValueError, TypeError) as e:
+            raise PlanningError(f"Invalid planner JSON: {e}")
+
+        tasks = plan.get("tasks")
+        if not isinstance(tasks, list):
+            raise PlanningError("Planner JSON missing 'tasks' list")
+
+        # Validate here so malformed plans raise PlanningError (and hit the
+        # sequential fallback) instead of KeyError deep in _execute_dag
+        seen_ids = set()
+        for task in tasks:
+            if not isinstance(task, dict):
+                raise PlanningError(f"Plan task is not an object: {task!r}")
+            task_id = task.get("id")
+            if not isinstance(task_id, int) or isinstance(task_id, bool):
+                raise PlanningError(f"Task id missing or not an integer: {task_id!r}")
+            if task_id in seen_ids:
+                raise PlanningError(f"Duplicate task id in plan: {task_id}")
+            seen_ids.add(task_id)
+            if task.get("tool") not in self.tools:
+                raise PlanningError(f"Unknown tool in plan: {task.get('tool')}")
+
+        return tasks
+
+    async def _execute_dag(self, tasks: List[Dict[str, Any]],
+                           speculative: Optional[Dict[str, Any]] = None) -> Dict[int, Any]:
+        """Run the task DAG, dispatching each ready frontier concurrently."""
+        pending = {task["id"]: task for task in tasks}
+        results: Dict[int, Any] = {}
+
+        while pending:
+            frontier = [
+                task for task in pending.values()
+                if all(dep in results for dep in task.get("deps", []))
+            ]
+            if not frontier:
+                self._cancel_speculation(speculative)
+                raise PlanningError("Cyclic or unsatisfiable task dependencies")
+
+            outputs = await asyncio.gather(
+                *[self._run_task(task, results, speculative) for task in frontier],
+                return_exceptions=True
+            )
+
+            for task, output in zip(frontier, outputs):
+                if isinstance(output, Exception):
+                    output = f"Tool '{task['tool']}' failed: {output}"
+                results[task["id"]] = output
+                del pending[task["id"]]
+
+        self._cancel_speculation(speculative)
+        return results
+
+    async def _run_task(self, task: Dict[str, Any], results: Dict[int, Any],
+                        speculative: Optional[Dict[str, Any]] = None) -> Any:
+        """Execute a single task with upstream placeholders substituted."""
+        tool = self.tools[task["tool"]]
+        args = self._substitute_refs(task.get("args", {}), results)
+
+        # Commit the speculative result when the planner's call matches it
+        if self._match_speculation(speculative, task, args) and not speculative["discarded"]:
+            speculative["committed"] = True
+            logger.info("Committing speculative generate_rust_crypto_algo result")
+            return await speculative["task"]
+
+        return await tool.ainvoke(args)
+
+    def _substitute_refs(self, args: Dict[str, Any], results: Dict[int, Any]) -> Dict[str, Any]:
+        """Replace $taskN placeholders in task args with completed results."""
+        substituted = {}
+        for key, value in args.items():
+            if isinstance(value, str):
+                value = _TASK_REF_RE.sub(
+                    lambda m: str(results.get(int(m.group(1)), m.group(0))),
+                    value
+                )
+            substituted[key] = value
+        return substituted
+
+    async def _fallback(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Delegate to the standard sequential agent executor."""
+        if self.fallback_executor is None:
+            raise PlanningError("No fallback executor configured")
+        return await self.fallback_executor.ainvoke(payload)
+
+
+def parallel_executor_enabled() -> bool:
+    """Whether the experimental parallel executor is enabled via environment."""
+    return os.getenv('AGENT_PARALLEL_EXECUTOR', '').lower() in ('true', '1', 'yes', 'on')
@@ -0,0 +1,127 @@
+"""Opt-in semantic cache that short-circuits near-duplicate queries."""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Optional dependencies: the embedding model ships with ChromaDB, which the
+# rest of the RAG stack already treats as optional
+try:
+    import numpy as np
+    from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    np = None
+    DefaultEmbeddingFunction = None
+    SEMANTIC_CACHE_AVAILABLE = False
+
+
+class SemanticResponseCache:
+    """Caches agent responses keyed by query embedding.
+
+    Rephrased repeats ("what's MFI on AAPL?" vs "show me MFI for AAPL") hit
+    the cache and skip the whole routing graph - routing LLM, symbol LLM,
+    agent LLM, and tool calls - for the cost of one local embedding plus a
+    vectorized dot-product scan over the cached queries.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.92,
+                 ttl_seconds: float = 300.0, max_size: int = 512):
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+
+        self._embedder = DefaultEmbeddingFunction()
+        self._matrix = None  # (N, D) int8 matrix of quantized query embeddings
+        self._entries: List[Dict[str, Any]] = []  # response/route/timestamp per row
+        # get/put run on asyncio.to_thread workers; the lock keeps _matrix
+        # and _entries in sync under concurrent mutation
+        self._lock = threading.Lock()
+
+    def _embed(self, text: str):
+        """Embed a query and quantize the unit-normalized vector to int8.
+
+        With unit vectors a single global scale of 127 suffices, so the
+        stored matrix is 4x smaller than float32 - more entries stay
+        cache-resident and the scan reads a quarter of the bandwidth - at a
+        negligible cost in cosine recall.
+        """
+        emb = np.asarray(self._embedder([text])[0], dtype=np.float32)
+        norm = np.linalg.norm(emb)
+        if norm:
+            emb /= norm
+        return np.clip(np.round(emb * 127), -128, 127).astype(np.int8)
+
+    def get(self, query: str) -> Optional[Tuple[str, str]]:
+        """Return (response, route_taken) for a semantically close cached query."""
+        # Embed outside the lock: the model call is the slow part and
+        # touches no shared state
+        q_emb = self._embed(query)
+
+        with self._lock:
+            self._prune_expired()
+            if not self._entries:
+                return None
+
+            # Accumulate in int32 (int8 @ int8 would overflow), then undo the
+            # 127-per-side quantization scale to recover cosine similarity
+            sims = (self._matrix.astype(np.int32) @ q_emb.astype(np.int32)) / (127 * 127)
+            best = int(np.argmax(sims))
+            if sims[best] < self.similarity_threshold:
+                return None
+
+            entry = self._entries[best]
+            logger.info("Semantic cache hit (similarity %.3f, route %s)",
+                        float(sims[best]), entry['route'])
+            return entry['response'], entry['route']
+
+    def put(self, query: str, response: str, route: Optional[str] = None) -> None:
+        """Store a completed response under the query's embedding."""
+        q_emb = self._embed(query)
+
+        with self._lock:
+            # FIFO eviction keeps the matrix bounded at max_size rows
+            if len(self._entries) >= self.max_size:
+                self._entries.pop(0)
+                self._matrix = self._matrix[1:]
+
+            row = q_emb.reshape(1, -1)
+            self._matrix = row if self._matrix is None else np.vstack((self._matrix, row))
+            self._entries.append({
+                'response': response,
+                'route': route,
+                'timestamp': time.time()
+            })
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._matrix = None
+            self._entries.clear()
+
+    def _prune_expired(self) -> None:
+        """Remove entries older than the TTL before scanning. Caller holds the lock."""
+        if not self._entries:
+            return
+
+        cutoff = time.time() - self.ttl_seconds
+        keep = [i for i, entry in enumerate(self._entries) if entry['timestamp'] >= cutoff]
+        if len(keep) == len(self._entries):
+            return
+
+        self._entries = [self._entries[i] for i in keep]
+        self._matrix = self._matrix[keep] if keep else None
+
+
+def semantic_cache_enabled() -> bool:
+    """Whether the semantic response cache is enabled via environment."""
+    if os.getenv('AGENT_SEMANTIC_CACHE', '').lower() not in ('true', '1', 'yes', 'on'):
+        return False
+    if not SEMANTIC_CACHE_AVAILABLE:
+        logger.warning("AGENT_SEMANTIC_CACHE set but numpy/chromadb are not installed")
+        return False
+    return True
@@ -0,0 +1,78 @@
+"""Pure-ASGI CORS middleware for the API."""
+
+from typing import Iterable
+
+
+class PureASGICORS:
+    """CORS handled directly at the ASGI layer.
+
+    Starlette-style middleware wraps every call in Request/Response
+    objects; this class instead answers preflights with a canned reply
+    and appends the allow-origin headers inside a send wrapper, so
+    non-CORS traffic pays only a header scan per request.
+    """
+
+    # Static tail of the preflight reply; allow-methods/-headers are
+    # echoed per request because the Fetch spec ignores wildcards on
+    # credentialed requests
+    _PREFLIGHT_HEADERS = [
+        (b"access-control-allow-credentials", b"true"),
+        (b"access-control-max-age", b"600"),
+        (b"vary", b"Origin"),
+        (b"content-length", b"0"),
+    ]
+
+    def __init__(self, app, origins: Iterable[str]):
+        self.app = app
+        self.origins = set(origins)
+        self.allow_all = "*" in self.origins
+
+    def _allowed(self, origin: bytes) -> bool:
+        return self.allow_all or origin.decode("latin-1") in self.origins
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = req_method = req_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                req_method = value
+            elif name == b"access-control-request-headers":
+                req_headers = value
+
+        # Same-origin / non-browser traffic: nothing to do
+        if origin is None or not self._allowed(origin):
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS":
+            # Short-circuit the preflight without entering the app. The
+            # requested method/headers are echoed back (wildcards are not
+            # honored for credentialed requests)
+            headers = [
+                (b"access-control-allow-origin", origin),
+                (b"access-control-allow-methods", req_method or b"*"),
+            ]
+            if req_headers:
+                headers.append((b"access-control-allow-headers", req_headers))
+            headers.extend(self._PREFLIGHT_HEADERS)
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers") or []) + [
+                    (b"access-control-allow-origin", origin),
+                    (b"access-control-allow-credentials", b"true"),
+                    # Shared caches must not replay one origin's
+                    # allow-origin to another
+                    (b"vary", b"Origin"),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,21 +1,165 @@
 """API endpoints with improved error handling and structure."""
 
-from fastapi import FastAPI, HTTPException, status
-from fastapi.middleware.cors import CORSMiddleware
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from functools import wraps
+
+from fastapi import FastAPI, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from datetime import datetime
 from typing import Optional
 
+from pydantic import ValidationError
+
 from .models import (
     ChatMessage, ChatResponse, ChatHistoryResponse, HealthResponse, ErrorResponse,
     ProjectCreateRequest, ProjectResponse, ProjectListResponse,
     DockerBuildRequest, DockerResponse,
-    KnowledgeBaseSearchRequest, KnowledgeBaseAddRequest, KnowledgeBaseResponse
+    KnowledgeBaseSearchRequest, KnowledgeBaseAddRequest, KnowledgeBaseResponse,
+    MSGSPEC_AVAILABLE, msgspec,
+    ChatMessageMs, KnowledgeBaseSearchRequestMs, DockerBuildRequestMs
 )
+from .cors import PureASGICORS
+from .orjson_response import ORJSON_AVAILABLE, default_response_class, orjson
 from config.settings import settings
 from services.project_service import project_service, ProjectCreationError
 from services.docker_service import docker_service, DockerError
 from services.rag_service import rag_service, RAGError
 
+logger = logging.getLogger("trade_agent.api")
+
+# Interned keys for dicts built in per-item loops: key lookups become
+# pointer compares instead of string equality
+_K_USER, _K_AGENT, _K_TS = map(sys.intern, ("user_message", "agent_response", "timestamp"))
+
+# Second-resolution timestamp cache: these endpoints only need wall-clock
+# labels, so one datetime construction per second serves every request
+_ts_cache = [0, ""]
+
+
+def _now_iso() -> str:
+    t = int(time.time())
+    if t != _ts_cache[0]:
+        _ts_cache[0] = t
+        _ts_cache[1] = datetime.fromtimestamp(t).isoformat()
+    return _ts_cache[1]
+
+
+def _ndjson_line(row) -> bytes:
+    """Serialize one streaming row as an NDJSON line."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(row) + b"\n"
+    return (json.dumps(row) + "\n").encode()
+
+
+async def _parse_body(request: Request, ms_type, model):
+    """Decode and validate a request body off the fast path.
+
+    msgspec fuses JSON decode and constraint checks into one native call;
+    when it is not installed the body goes through the Pydantic model so
+    behavior (and 422 semantics) stay the same.
+    """
+    body = await request.body()
+    if MSGSPEC_AVAILABLE:
+        try:
+            return msgspec.json.decode(body, type=ms_type)
+        except msgspec.DecodeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            )
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors()
+        )
+
+
+def _body_schema(model) -> dict:
+    """Advertise a Pydantic body model for endpoints that read the raw Request.
+
+    Switching handlers to a raw Request (for the msgspec fast path) drops
+    the body model from the generated OpenAPI schema; passing this as
+    openapi_extra keeps /docs documenting and exercising the body without
+    putting the model back in the signature.
+    """
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": model.model_json_schema()}
+            },
+        }
+    }
+
+
+def _response_schema(model) -> dict:
+    """Advertise a Pydantic response model for endpoints that return dicts.
+
+    Counterpart of _body_schema: returning the service's dict directly
+    skips the response-model re-validation walk, but response_model=None
+    also drops the schema from OpenAPI. This puts the model's JSON schema
+    back on the 200 response without re-enabling validation.
+    """
+    return {
+        "responses": {
+            "200": {
+                "description": "Successful Response",
+                "content": {"application/json": {"schema": model.model_json_schema()}},
+            }
+        }
+    }
+
+
+def http_500_on_unexpected(detail: str = "Unexpected error"):
+    """Convert unexpected handler exceptions into a 500 response.
+
+    One shared wrapper replaces the per-endpoint try/except boilerplate;
+    HTTPExceptions (including the 503 agent guard) pass through untouched
+    and the detail prefix keeps each endpoint's original error message.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"{detail}: {e}"
+                )
+        return wrapper
+    return decorator
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """Build the shared agent once per process at startup."""
+    try:
+        # Validate settings
+        settings.validate_required_settings()
+
+        # Initialize agent (heavy LangChain/SDK imports happen here, not
+        # on the first /chat request)
+        from agents.finance_agent import FinanceAgent
+        app.state.agent = FinanceAgent()
+        logger.info("Finance Agent initialized successfully")
+
+    except Exception as e:
+        logger.error("Failed to initialize services: %s", e)
+        # Don't raise - let the app start but show errors in health check
+
+    yield
+
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
@@ -23,63 +167,79 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title="Trade Agent API",
         version="2.0.0",
-        description="AI-powered trading algorithm generation and management API"
+        description="AI-powered trading algorithm generation and management API",
+        default_response_class=default_response_class(),
+        lifespan=_lifespan
     )
     
-    # Configure CORS
+    # Configure CORS (pure-ASGI handler; see api.cors)
     api_config = settings.api_config
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=api_config['cors_origins'],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
+    app.add_middleware(PureASGICORS, origins=api_config['cors_origins'])
     
-    # Global agent instance
-    agent = None
-    
-    @app.on_event("startup")
-    async def startup_event():
-        """Initialize services on startup."""
-        nonlocal agent
-        try:
-            # Validate settings
-            settings.validate_required_settings()
-            
-            # Initialize agent
-            from agents.finance_agent import FinanceAgent
-            agent = FinanceAgent()
-            print("✅ Finance Agent initialized successfully")
-            
-        except Exception as e:
-            print(f"❌ Failed to initialize services: {e}")
-            # Don't raise - let the app start but show errors in health check
+    # Agent lives on app.state so handlers and external tooling share one
+    # well-known slot instead of a closure cell private to create_app
+    app.state.agent = None
     
+    # Short-lived /health cache: polling dashboards hit this endpoint
+    # frequently, and each miss costs a Docker subprocess probe
+    _health_cache = {"etag": None, "body": None, "ts": 0.0}
+    # The Docker probe shells out, so it gets its own longer window
+    _docker_state = [0.0, False]
+
+    def _docker_available(now: float) -> bool:
+        if now - _docker_state[0] > 30 or _docker_state[0] == 0.0:
+            _docker_state[:] = [now, docker_service.is_docker_available()]
+        return _docker_state[1]
+
     @app.get("/health", response_model=HealthResponse)
-    async def health_check():
+    async def health_check(request: Request):
         """Comprehensive health check endpoint."""
-        return HealthResponse(
-            status="healthy" if agent else "degraded",
-            service="Trade Agent API v2.0",
-            agent_initialized=agent is not None,
-            rag_service_available=rag_service is not None,
-            docker_available=docker_service.is_docker_available(),
-            timestamp=datetime.now().isoformat()
+        now = time.monotonic()
+        if _health_cache["body"] is None or now - _health_cache["ts"] >= 5:
+            agent = app.state.agent
+            payload = HealthResponse(
+                status="healthy" if agent else "degraded",
+                service="Trade Agent API v2.0",
+                agent_initialized=agent is not None,
+                rag_service_available=rag_service is not None,
+                docker_available=_docker_available(now),
+                timestamp=_now_iso()
+            )
+            body = payload.model_dump_json().encode()
+            _health_cache.update(
+                etag=hashlib.blake2b(body, digest_size=8).hexdigest(),
+                body=body,
+                ts=now
+            )
+
+        etag = _health_cache["etag"]
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+
+        return Response(
+            content=_health_cache["body"],
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": "max-age=5"}
         )
     
     # Chat endpoints
-    @app.post("/chat", response_model=ChatResponse)
-    async def chat_endpoint(chat_message: ChatMessage):
+    @app.post("/chat", response_model=ChatResponse, openapi_extra=_body_schema(ChatMessage))
+    async def chat_endpoint(request: Request):
         """Send a message to the finance agent and get response."""
+        agent = app.state.agent
         if not agent:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Finance agent not initialized"
             )
-        
+
+        chat_message = await _parse_body(request, ChatMessageMs, ChatMessage)
+
         try:
-            response = agent.process_message(chat_message.message)
+            # Await the agent's async path directly: the event loop stays
+            # free during LLM round-trips, so concurrent chats interleave
+            # instead of queueing behind a blocking invoke
+            response = await agent.aprocess_message_with_routing(chat_message.message)
             return ChatResponse(response=response, success=True)
         except Exception as e:
             return ChatResponse(
@@ -88,60 +248,78 @@ def create_app() -> FastAPI:
                 error=str(e)
             )
     
+    @app.post("/chat/stream", openapi_extra=_body_schema(ChatMessage))
+    async def chat_stream_endpoint(request: Request):
+        """Stream the agent's reply as plain-text token chunks.
+
+        /chat keeps the buffered JSON shape; this variant flushes each
+        model chunk as it decodes, so clients render at time-to-first-
+        token instead of waiting for the full response.
+        """
+        agent = app.state.agent
+        if not agent:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Finance agent not initialized"
+            )
+
+        chat_message = await _parse_body(request, ChatMessageMs, ChatMessage)
+
+        return StreamingResponse(
+            agent.astream_message(chat_message.message),
+            media_type="text/plain; charset=utf-8"
+        )
+
     @app.get("/chat/history", response_model=ChatHistoryResponse)
+    @http_500_on_unexpected("Failed to retrieve chat history")
     async def get_chat_history():
         """Get the current chat history."""
+        agent = app.state.agent
         if not agent:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Finance agent not initialized"
             )
-        
-        try:
-            history_items = []
-            chat_history = agent.chat_history
-            
-            for i in range(0, len(chat_history), 2):
-                if i + 1 < len(chat_history):
-                    user_msg = chat_history[i]
-                    agent_msg = chat_history[i + 1]
-                    history_items.append({
-                        "user_message": user_msg.content,
-                        "agent_response": agent_msg.content,
-                        "timestamp": datetime.now().isoformat()
-                    })
-            
-            return ChatHistoryResponse(history=history_items, success=True)
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to retrieve chat history: {str(e)}"
-            )
+
+        # The agent keeps turns as two parallel string deques, so the
+        # pairs come straight from zip with no message-object walking;
+        # one timestamp serves the whole snapshot
+        ts = _now_iso()
+        history_items = [
+            {
+                _K_USER: user_msg,
+                _K_AGENT: agent_msg,
+                _K_TS: ts
+            }
+            for user_msg, agent_msg in zip(agent.user_msgs, agent.agent_msgs)
+        ]
+
+        return ChatHistoryResponse(history=history_items, success=True)
     
     @app.delete("/chat/history")
+    @http_500_on_unexpected("Failed to clear chat history")
     async def clear_chat_history():
         """Clear the chat history."""
+        agent = app.state.agent
         if not agent:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Finance agent not initialized"
             )
-        
-        try:
-            agent.chat_history = []
-            return {"success": True, "message": "Chat history cleared"}
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to clear chat history: {str(e)}"
-            )
+
+        agent.clear_history()
+        return {"success": True, "message": "Chat history cleared"}
     
     # Project management endpoints
     @app.post("/projects", response_model=ProjectResponse)
+    @http_500_on_unexpected()
     async def create_project(request: ProjectCreateRequest):
         """Create a new trading algorithm project."""
         try:
-            result = project_service.create_rust_project(
+            # Dispatch onto the codegen pool: templating and file writes
+            # are blocking, and running them inline would stall the event
+            # loop for every concurrent request
+            result = await project_service.acreate_rust_project(
                 request.algorithm_description,
                 request.custom_params
             )
@@ -184,27 +362,20 @@ def create_app() -> FastAPI:
                 message="Project creation failed",
                 error=str(e)
             )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Unexpected error: {str(e)}"
-            )
     
-    @app.get("/projects", response_model=ProjectListResponse)
+    @app.get("/projects", response_model=None, openapi_extra=_response_schema(ProjectListResponse))
+    @http_500_on_unexpected("Failed to list projects")
     async def list_projects():  # type: ignore
         """List all generated projects."""
-        try:
-            result = project_service.list_projects()
-            return ProjectListResponse(
-                projects=result['projects'],
-                count=result['count'],
-                success=True
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to list projects: {str(e)}"
-            )
+        # The service already emits the wire shape; returning the dict
+        # skips the response-model re-validation walk while openapi_extra
+        # keeps ProjectListResponse as the documented schema
+        result = project_service.list_projects()
+        return {
+            'projects': result['projects'],
+            'count': result['count'],
+            'success': True
+        }
     
     @app.get("/projects/{project_name}")
     async def get_project_info(project_name: str):  # type: ignore
@@ -219,9 +390,12 @@ def create_app() -> FastAPI:
             )
     
     # Docker endpoints
-    @app.post("/docker/build", response_model=DockerResponse)
-    async def build_docker_image(request: DockerBuildRequest):  # type: ignore
+    @app.post("/docker/build", response_model=DockerResponse,
+              openapi_extra=_body_schema(DockerBuildRequest))
+    @http_500_on_unexpected()
+    async def build_docker_image(raw_request: Request):  # type: ignore
         """Build a Docker image for an existing project."""
+        request = await _parse_body(raw_request, DockerBuildRequestMs, DockerBuildRequest)
         try:
             # Determine image name
             if request.custom_name:
@@ -254,28 +428,21 @@ def create_app() -> FastAPI:
                 message="Docker build failed",
                 error=str(e)
             )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Unexpected error: {str(e)}"
-            )
     
     @app.get("/docker/images")
+    @http_500_on_unexpected("Failed to list Docker images")
     async def list_docker_images():  # type: ignore
         """List Docker images."""
-        try:
-            images = docker_service.list_images()
-            return {"success": True, "images": images}
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to list Docker images: {str(e)}"
-            )
+        images = docker_service.list_images()
+        return {"success": True, "images": images}
     
     # Knowledge base endpoints
-    @app.post("/knowledge/search", response_model=KnowledgeBaseResponse)
-    async def search_knowledge_base(request: KnowledgeBaseSearchRequest):  # type: ignore
+    @app.post("/knowledge/search", response_model=KnowledgeBaseResponse,
+              openapi_extra=_body_schema(KnowledgeBaseSearchRequest))
+    @http_500_on_unexpected()
+    async def search_knowledge_base(raw_request: Request):  # type: ignore
         """Search the knowledge base."""
+        request = await _parse_body(raw_request, KnowledgeBaseSearchRequestMs, KnowledgeBaseSearchRequest)
         try:
             if not rag_service:
                 return KnowledgeBaseResponse(
@@ -302,13 +469,41 @@ def create_app() -> FastAPI:
                 message="Knowledge base search failed",
                 error=str(e)
             )
-        except Exception as e:
+    
+    @app.post("/knowledge/search/stream", openapi_extra=_body_schema(KnowledgeBaseSearchRequest))
+    async def search_knowledge_base_stream(raw_request: Request):  # type: ignore
+        """Stream knowledge base hits as NDJSON, one line per result.
+
+        The legacy JSON-array shape stays on /knowledge/search; this
+        variant gives clients the first hit as soon as it is formatted
+        and never holds the full result list in memory.
+        """
+        request = await _parse_body(raw_request, KnowledgeBaseSearchRequestMs, KnowledgeBaseSearchRequest)
+        if not rag_service:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="RAG service not available (ChromaDB may not be installed)"
+            )
+
+        try:
+            rows = rag_service.stream_documents(
+                request.query,
+                request.n_results,
+                request.topic_filter
+            )
+        except RAGError as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Unexpected error: {str(e)}"
+                detail=f"Knowledge base search failed: {e}"
             )
-    
+
+        return StreamingResponse(
+            (_ndjson_line(row) for row in rows),
+            media_type="application/x-ndjson"
+        )
+
     @app.post("/knowledge/add", response_model=KnowledgeBaseResponse)
+    @http_500_on_unexpected()
     async def add_to_knowledge_base(request: KnowledgeBaseAddRequest):  # type: ignore
         """Add content to the knowledge base."""
         try:
@@ -333,53 +528,75 @@ def create_app() -> FastAPI:
                 message="Failed to add content",
                 error=str(e)
             )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Unexpected error: {str(e)}"
-            )
     
-    @app.get("/knowledge/stats", response_model=KnowledgeBaseResponse)
+    @app.get("/knowledge/stats", response_model=None)
+    @http_500_on_unexpected()
     async def get_knowledge_base_stats():  # type: ignore
         """Get knowledge base statistics."""
         try:
             if not rag_service:
-                return KnowledgeBaseResponse(
-                    success=False,
-                    message="RAG service not available",
-                    error="ChromaDB may not be installed"
-                )
-            
+                return {
+                    'success': False,
+                    'message': "RAG service not available",
+                    'error': "ChromaDB may not be installed"
+                }
+
             stats = rag_service.get_collection_stats()
-            
-            return KnowledgeBaseResponse(
-                success=True,
-                stats=stats,
-                message="Knowledge base statistics retrieved"
-            )
-            
+
+            return {
+                'success': True,
+                'stats': stats,
+                'message': "Knowledge base statistics retrieved"
+            }
+
         except RAGError as e:
-            return KnowledgeBaseResponse(
-                success=False,
-                message="Failed to get statistics",
-                error=str(e)
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Unexpected error: {str(e)}"
-            )
+            return {
+                'success': False,
+                'message': "Failed to get statistics",
+                'error': str(e)
+            }
     
     return app
 
 
+# Module-level app so uvicorn can address it by import string: reload
+# works, and multi-worker mode forks after import with schemas already
+# compiled
+app = create_app()
+
+
 def run_api_server(host: str = None, port: int = None):
     """Run the FastAPI server."""
     import uvicorn
-    
+
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        format="%(asctime)s %(name)s %(levelname)s %(message)s"
+    )
+
     api_config = settings.api_config
     host = host or api_config['host']
     port = port or api_config['port']
-    
-    app = create_app()
-    uvicorn.run(app, host=host, port=port)
\ No newline at end of file
+
+    # uvloop and httptools ship with uvicorn[standard]; probe for them so
+    # the server still starts on a bare uvicorn install
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "auto"
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "auto"
+
+    uvicorn.run(
+        "api.endpoints:app",
+        host=host,
+        port=port,
+        loop=loop,
+        http=http,
+        workers=api_config['workers'],
+        access_log=api_config['access_log']
+    )
\ No newline at end of file
@@ -1,43 +1,66 @@
 """API request and response models."""
 
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Annotated, List, Optional, Dict, Any
 from datetime import datetime
 
+# Optional dependency: msgspec validates small request bodies in native
+# code; the Pydantic models below remain the fallback and schema source
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    msgspec = None
+    MSGSPEC_AVAILABLE = False
 
-class ChatMessage(BaseModel):
+
+class APIModel(BaseModel):
+    """Base for all API models.
+
+    The shared config keeps pydantic-core on its fast path: unknown keys
+    are dropped instead of walked, and instances are never revalidated
+    after construction.
+    """
+    model_config = ConfigDict(
+        extra='ignore',
+        validate_assignment=False,
+        revalidate_instances='never',
+    )
+
+
+class ChatMessage(APIModel):
     """Chat message request model."""
     message: str = Field(..., min_length=1, max_length=5000, description="The chat message")
 
 
-class ChatResponse(BaseModel):
+class ChatResponse(APIModel):
     """Chat response model."""
     response: str = Field(..., description="The agent's response")
     success: bool = Field(..., description="Whether the request was successful")
     error: Optional[str] = Field(None, description="Error message if any")
 
 
-class ChatHistoryItem(BaseModel):
+class ChatHistoryItem(APIModel):
     """Individual chat history item."""
     user_message: str = Field(..., description="User's message")
     agent_response: str = Field(..., description="Agent's response")
     timestamp: str = Field(..., description="Message timestamp")
 
 
-class ChatHistoryResponse(BaseModel):
+class ChatHistoryResponse(APIModel):
     """Chat history response model."""
     history: List[ChatHistoryItem] = Field(..., description="Chat history items")
     success: bool = Field(..., description="Whether the request was successful")
 
 
-class ProjectCreateRequest(BaseModel):
+class ProjectCreateRequest(APIModel):
     """Project creation request model."""
     algorithm_description: str = Field(..., min_length=10, max_length=1000, description="Algorithm description")
     build_docker: bool = Field(False, description="Whether to build Docker image")
     custom_params: Optional[Dict[str, Any]] = Field(None, description="Custom strategy parameters")
 
 
-class ProjectResponse(BaseModel):
+class ProjectResponse(APIModel):
     """Project operation response model."""
     success: bool = Field(..., description="Whether the operation was successful")
     project_name: Optional[str] = Field(None, description="Generated project name")
@@ -48,20 +71,30 @@ class ProjectResponse(BaseModel):
     error: Optional[str] = Field(None, description="Error message if any")
 
 
-class ProjectListResponse(BaseModel):
+class ProjectInfo(APIModel):
+    """Summary of one generated project, as produced by list_projects."""
+    name: str = Field(..., description="Project directory name")
+    path: str = Field(..., description="Absolute project path")
+    created: str = Field(..., description="Creation timestamp (ISO format)")
+    has_cargo: bool = Field(False, description="Whether Cargo.toml exists")
+    has_dockerfile: bool = Field(False, description="Whether a Dockerfile exists")
+    has_readme: bool = Field(False, description="Whether README.md exists")
+
+
+class ProjectListResponse(APIModel):
     """Project list response model."""
-    projects: List[Dict[str, Any]] = Field(..., description="List of projects")
+    projects: List[ProjectInfo] = Field(..., description="List of projects")
     count: int = Field(..., description="Number of projects")
     success: bool = Field(..., description="Whether the request was successful")
 
 
-class DockerBuildRequest(BaseModel):
+class DockerBuildRequest(APIModel):
     """Docker build request model."""
     project_path: str = Field(..., description="Path to the project directory")
     custom_name: Optional[str] = Field(None, description="Custom Docker image name")
 
 
-class DockerResponse(BaseModel):
+class DockerResponse(APIModel):
     """Docker operation response model."""
     success: bool = Field(..., description="Whether the operation was successful")
     image_name: Optional[str] = Field(None, description="Docker image name")
@@ -71,20 +104,20 @@ class DockerResponse(BaseModel):
     error: Optional[str] = Field(None, description="Error message if any")
 
 
-class KnowledgeBaseSearchRequest(BaseModel):
+class KnowledgeBaseSearchRequest(APIModel):
     """Knowledge base search request model."""
     query: str = Field(..., min_length=1, max_length=500, description="Search query")
     topic_filter: Optional[str] = Field(None, description="Filter by topic")
     n_results: int = Field(5, ge=1, le=20, description="Number of results to return")
 
 
-class KnowledgeBaseAddRequest(BaseModel):
+class KnowledgeBaseAddRequest(APIModel):
     """Knowledge base add content request model."""
     content: str = Field(..., min_length=10, max_length=10000, description="Content to add")
     topic: str = Field(..., min_length=1, max_length=100, description="Content topic/category")
 
 
-class KnowledgeBaseResponse(BaseModel):
+class KnowledgeBaseResponse(APIModel):
     """Knowledge base operation response model."""
     success: bool = Field(..., description="Whether the operation was successful")
     results: Optional[List[Dict[str, Any]]] = Field(None, description="Search results")
@@ -94,7 +127,7 @@ class KnowledgeBaseResponse(BaseModel):
     error: Optional[str] = Field(None, description="Error message if any")
 
 
-class HealthResponse(BaseModel):
+class HealthResponse(APIModel):
     """Health check response model."""
     status: str = Field(..., description="Service status")
     service: str = Field(..., description="Service name")
@@ -104,9 +137,29 @@ class HealthResponse(BaseModel):
     timestamp: str = Field(..., description="Health check timestamp")
 
 
-class ErrorResponse(BaseModel):
+class ErrorResponse(APIModel):
     """Standard error response model."""
     success: bool = Field(False, description="Always false for errors")
     error: str = Field(..., description="Error message")
     error_type: Optional[str] = Field(None, description="Error type/category")
-    timestamp: str = Field(..., description="Error timestamp")
\ No newline at end of file
+    timestamp: str = Field(..., description="Error timestamp")
+
+if MSGSPEC_AVAILABLE:
+    # msgspec mirrors of the hot POST bodies: decode + validate happen in
+    # one native call, with the same field constraints as the Pydantic
+    # models they shadow
+    class ChatMessageMs(msgspec.Struct, frozen=True):
+        message: Annotated[str, msgspec.Meta(min_length=1, max_length=5000)]
+
+    class KnowledgeBaseSearchRequestMs(msgspec.Struct, frozen=True):
+        query: Annotated[str, msgspec.Meta(min_length=1, max_length=500)]
+        topic_filter: Optional[str] = None
+        n_results: Annotated[int, msgspec.Meta(ge=1, le=20)] = 5
+
+    class DockerBuildRequestMs(msgspec.Struct, frozen=True):
+        project_path: str
+        custom_name: Optional[str] = None
+else:
+    ChatMessageMs = None
+    KnowledgeBaseSearchRequestMs = None
+    DockerBuildRequestMs = None
@@ -0,0 +1,35 @@
+"""orjson-backed response class for faster JSON serialization."""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+# Optional dependency: fall back to the stdlib serializer when orjson is
+# not installed so the API keeps working either way
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson.
+
+    orjson emits UTF-8 bytes directly from native code, skipping the
+    Python-level str building stdlib json does - a measurable win on the
+    list-heavy payloads (project lists, knowledge base results).
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+        )
+
+
+def default_response_class():
+    """Response class for create_app: orjson when installed, stdlib otherwise."""
+    return ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
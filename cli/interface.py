@@ -1,22 +1,65 @@
 """Enhanced CLI interface for the Finance Agent."""
 
-from typing import List, Dict, Any
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from heapq import nlargest
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Tuple
+
+# Optional dependency: a PromptSession keeps line-editing state across
+# reads instead of rebuilding it per input() call; the plain builtin is
+# the fallback when prompt_toolkit is not installed
+try:
+    from prompt_toolkit import PromptSession
+    PROMPT_TOOLKIT_AVAILABLE = True
+except ImportError:
+    PromptSession = None
+    PROMPT_TOOLKIT_AVAILABLE = False
 
 from agents.finance_agent import FinanceAgent, FinanceAgentError
-from services.rag_service import rag_service
-from services.docker_service import docker_service
-from services.project_service import project_service
 
+# Service singletons are imported lazily: chromadb and the Docker
+# tooling sit behind these modules and cost hundreds of ms to import,
+# which quick sessions ('help', immediate 'exit') never need
+_rag_service = None
+_rag_loaded = False
+_docker_service = None
+_project_service = None
 
-class CLI:
-    """Enhanced command line interface for the Finance Agent."""
-    
-    def __init__(self, agent: FinanceAgent):
-        self.agent = agent
-    
-    def run_chat_cli(self):
-        """Run the terminal-based chat interface with enhanced features."""
-        print('''🚀 Welcome to Trade Agent v2.0 CLI!
+
+def _rag():
+    """Return the RAG service singleton, importing it on first use."""
+    global _rag_service, _rag_loaded
+    if not _rag_loaded:  # the singleton itself may legitimately be None
+        from services.rag_service import rag_service
+        _rag_service = rag_service
+        _rag_loaded = True
+    return _rag_service
+
+
+def _docker():
+    """Return the Docker service singleton, importing it on first use."""
+    global _docker_service
+    if _docker_service is None:
+        from services.docker_service import docker_service
+        _docker_service = docker_service
+    return _docker_service
+
+
+def _projects():
+    """Return the project service singleton, importing it on first use."""
+    global _project_service
+    if _project_service is None:
+        from services.project_service import project_service
+        _project_service = project_service
+    return _project_service
+
+
+# Startup banner rendered once at import; run_chat_cli issues it as a
+# single stdout write instead of per-line prints
+_BANNER = '''🚀 Welcome to Trade Agent v2.0 CLI!
         
 🤖 Enhanced AI Assistant Features:
   • Advanced Rust algorithm generation with automatic containerization
@@ -34,46 +77,138 @@ class CLI:
   • 'routing' - Show routing system status
   • 'routing toggle' - Enable/disable intelligent routing
   • 'help' - Show this help message
-''')
+'''
+
+# Shared status markers; reused across all _show_* renderers
+_OK = "✅"
+_FAIL = "❌"
+_WARN = "⚠️"
+
+# Static bodies for the 'routing' command; the text is constant, only
+# the status line is formatted per invocation
+_ROUTING_ENABLED_TEXT = '''
+📋 Available Routes:
+  • algorithm_generation - Code generation and Docker operations
+  • technical_analysis - MFI analysis and stock/crypto signals
+  • rag_search - Knowledge base and strategy searches
+  • mixed_analysis - Combined technical + algorithm/search requests
+  • general_agent - General trading questions and explanations
+
+🎯 How Routing Works:
+  • Queries are automatically classified using AI
+  • Each route uses optimized tools and context
+  • Technical analysis gets real-time market data
+  • Algorithm requests get specialized code generation
+  • Mixed requests combine multiple capabilities
+
+💡 Benefits:
+  • Faster, more focused responses
+  • Automatic symbol extraction and analysis
+  • Context-aware tool selection
+  • Optimized for different query types'''
+
+_ROUTING_DISABLED_TEXT = '''
+⚠️  Routing is disabled - using fallback mode
+  • All queries processed with standard agent
+  • Use 'routing toggle' to enable intelligent routing'''
+
+# Shared pool for overlapping the blocking health/stats probes (Docker
+# socket, ChromaDB, filesystem); module-level so it amortizes across
+# command invocations
+_HEALTH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="health")
+
+
+class CLI:
+    """Enhanced command line interface for the Finance Agent."""
+
+    # Fixed attribute set: slot loads skip the per-instance dict probe,
+    # which matters for the self.agent read on every chat-loop message
+    __slots__ = ('agent', '_prompt_session', '_stat_cache', '_commands')
+
+    def __init__(self, agent: FinanceAgent):
+        self.agent = agent
+        self._prompt_session = PromptSession() if PROMPT_TOOLKIT_AVAILABLE else None
+        # Short-TTL cache for status/stats lookups so a burst of commands
+        # (e.g. 'stats' then 'health') doesn't re-probe Docker/Chroma/FS
+        self._stat_cache: Dict[str, Tuple[float, Any]] = {}
+        # O(1) command dispatch; replaces the elif chain in the chat loop
+        self._commands: Dict[str, Callable[[], Any]] = {
+            'exit': self._cmd_exit,
+            'quit': self._cmd_exit,
+            'history': self.agent.display_chat_history,
+            'clear': self._cmd_clear,
+            'stats': self._show_statistics,
+            'health': self._show_health_check,
+            'help': self._show_help,
+            'routing': self._show_routing_info,
+        }
+
+    def _cmd_exit(self) -> str:
+        """Handle 'exit'/'quit'; the sentinel tells the loop to stop."""
+        print("👋 Goodbye! Happy trading!")
+        return 'EXIT'
+
+    def _cmd_clear(self):
+        """Handle 'clear': drop chat history and cached stats."""
+        self.agent.clear_history()
+        self._stat_cache.clear()
+        print("✅ Chat history cleared")
+
+    def _cached(self, key: str, ttl: float, fn: Callable[[], Any]) -> Any:
+        """Return fn()'s result, reusing a cached value younger than ttl."""
+        now = time.monotonic()
+        entry = self._stat_cache.get(key)
+        if entry is not None and now - entry[0] <= ttl:
+            return entry[1]
+        value = fn()
+        self._stat_cache[key] = (now, value)
+        return value
+
+    def _stream_response(self, user_input: str) -> None:
+        """Echo the agent's token stream as chunks arrive."""
+        async def _consume():
+            async for chunk in self.agent.astream_message(user_input):
+                print(chunk, end="", flush=True)
+
+        asyncio.run(_consume())
+        print()
+
+    def _read_input(self, prompt: str) -> str:
+        """Read one line of user input, via prompt_toolkit when available."""
+        if self._prompt_session is not None:
+            return self._prompt_session.prompt(prompt)
+        return input(prompt)
+
+
+    def run_chat_cli(self):
+        """Run the terminal-based chat interface with enhanced features."""
+        sys.stdout.write(_BANNER)
         
         self._show_system_status()
         
         while True:
             try:
-                user_input = input("\\n💬 You: ").strip()
-                
-                if user_input.lower() in ['exit', 'quit']:
-                    print("👋 Goodbye! Happy trading!")
-                    break
-                elif user_input.lower() == 'history':
-                    self.agent.display_chat_history()
-                    continue
-                elif user_input.lower() == 'clear':
-                    self.agent.clear_history()
-                    print("✅ Chat history cleared")
-                    continue
-                elif user_input.lower() == 'stats':
-                    self._show_statistics()
-                    continue
-                elif user_input.lower() == 'health':
-                    self._show_health_check()
-                    continue
-                elif user_input.lower() == 'help':
-                    self._show_help()
+                user_input = self._read_input("\\n💬 You: ").strip()
+                if not user_input:  # bare Enter: cheapest check first
+                    print("Please enter a message or command.")
                     continue
-                elif user_input.lower() == 'routing':
-                    self._show_routing_info()
+                command = user_input.lower()  # lowercase once per iteration
+
+                handler = self._commands.get(command)
+                if handler is not None:
+                    if handler() == 'EXIT':
+                        break
                     continue
-                elif user_input.lower().startswith('routing '):
+                if command.startswith('routing '):
                     self._handle_routing_command(user_input[8:].strip())
                     continue
-                elif not user_input:
-                    print("Please enter a message or command.")
-                    continue
 
                 print("\\n🤖 Agent: ", end="", flush=True)
-                response = self.agent.process_message(user_input)
-                print(response)
+                if self.agent.routing_enabled:
+                    # Routed replies come back whole from the graph
+                    print(self.agent.process_message(user_input))
+                else:
+                    self._stream_response(user_input)
 
             except KeyboardInterrupt:
                 print("\\n\\n👋 Exiting chat. Goodbye!")
@@ -84,149 +219,206 @@ class CLI:
     
     def _show_system_status(self):
         """Show initial system status."""
-        print("\\n📊 System Status:")
+        lines = []
+        lines.append("\\n📊 System Status:")
         
         # Agent status
-        agent_stats = self.agent.get_agent_stats()
-        print(f"  🤖 Agent: ✅ Ready ({agent_stats['available_tools']} tools available)")
+        agent_stats = self._cached('agent_stats', 2.0, self.agent.get_agent_stats)
+        lines.append(f"  🤖 Agent: {_OK} Ready ({agent_stats['available_tools']} tools available)")
         
         # RAG service status
-        if rag_service:
+        if _rag():
             try:
-                stats = rag_service.get_collection_stats()
-                print(f"  📚 Knowledge Base: ✅ Ready ({stats['total_documents']} documents)")
+                stats = self._cached('rag_stats', 5.0, _rag().get_collection_stats)
+                lines.append(f"  📚 Knowledge Base: {_OK} Ready ({stats['total_documents']} documents)")
             except Exception:
-                print("  📚 Knowledge Base: ⚠️  Available but may have issues")
+                lines.append(f"  📚 Knowledge Base: {_WARN}  Available but may have issues")
         else:
-            print("  📚 Knowledge Base: ❌ Not available (ChromaDB not installed)")
+            lines.append(f"  📚 Knowledge Base: {_FAIL} Not available (ChromaDB not installed)")
         
         # Docker status
-        if docker_service.is_docker_available():
-            print("  🐳 Docker: ✅ Available")
+        if self._cached('docker_available', 10.0, _docker().is_docker_available):
+            lines.append(f"  🐳 Docker: {_OK} Available")
         else:
-            print("  🐳 Docker: ❌ Not available")
+            lines.append(f"  🐳 Docker: {_FAIL} Not available")
         
         # Project service
         try:
-            project_stats = project_service.list_projects()
-            print(f"  📁 Projects: ✅ Ready ({project_stats['count']} existing projects)")
+            project_stats = self._cached('projects', 5.0, _projects().list_projects)
+            lines.append(f"  📁 Projects: {_OK} Ready ({project_stats['count']} existing projects)")
         except Exception:
-            print("  📁 Projects: ⚠️  Service available but may have issues")
+            lines.append(f"  📁 Projects: {_WARN}  Service available but may have issues")
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def _show_statistics(self):
         """Show detailed system statistics."""
-        print("\\n📊 Detailed System Statistics:\\n")
-        
+        lines = []
+        lines.append("\\n📊 Detailed System Statistics:\\n")
+
+        # Warm the stat cache with all probes in parallel; the _cached
+        # lookups below then hit memory instead of probing sequentially
+        self._run_probes()
+
         # Agent statistics
-        agent_stats = self.agent.get_agent_stats()
-        print("🤖 Agent Statistics:")
-        print(f"  • Model: {agent_stats['llm_model']}")
-        print(f"  • Chat History: {agent_stats['chat_history_length']}/{agent_stats['max_chat_history']} messages")
-        print(f"  • Available Tools: {agent_stats['available_tools']}")
-        print(f"  • Tool Names: {', '.join(agent_stats['tool_names'])}")
-        print(f"  • Intelligent Routing: {'✅ Enabled' if agent_stats.get('routing_enabled', False) else '❌ Disabled'}")
+        agent_stats = self._cached('agent_stats', 2.0, self.agent.get_agent_stats)
+        lines.append("🤖 Agent Statistics:")
+        lines.append(f"  • Model: {agent_stats['llm_model']}")
+        lines.append(f"  • Chat History: {agent_stats['chat_history_length']}/{agent_stats['max_chat_history']} messages")
+        lines.append(f"  • Available Tools: {agent_stats['available_tools']}")
+        lines.append(f"  • Tool Names: {', '.join(agent_stats['tool_names'])}")
+        routing_on = agent_stats.get('routing_enabled', False)
+        lines.append(f"  • Intelligent Routing: {_OK + ' Enabled' if routing_on else _FAIL + ' Disabled'}")
         
         # RAG statistics
-        if rag_service:
+        if _rag():
             try:
-                rag_stats = rag_service.get_collection_stats()
-                print("\\n📚 Knowledge Base Statistics:")
-                print(f"  • Total Documents: {rag_stats['total_documents']}")
-                print(f"  • Total Content: {rag_stats['total_content_length']:,} characters")
-                print(f"  • Average Length: {rag_stats['average_content_length']:.1f} chars/doc")
-                if rag_stats['topics']:
-                    print("  • Topics:")
-                    for topic, count in sorted(rag_stats['topics'].items(), key=lambda x: x[1], reverse=True):
-                        print(f"    - {topic}: {count} documents")
+                rag_stats = self._cached('rag_stats', 5.0, _rag().get_collection_stats)
+                # Pull fields into locals once instead of re-hashing the
+                # dict inside each f-string
+                total_docs = rag_stats['total_documents']
+                total_length = rag_stats['total_content_length']
+                avg_length = rag_stats['average_content_length']
+                topics = rag_stats['topics']
+                lines.append("\\n📚 Knowledge Base Statistics:")
+                lines.append(f"  • Total Documents: {total_docs}")
+                lines.append(f"  • Total Content: {total_length:,} characters")
+                lines.append(f"  • Average Length: {avg_length:.1f} chars/doc")
+                if topics:
+                    # Top-K heap select beats a full sort once the topic
+                    # count grows; itemgetter keeps the key in C
+                    lines.append("  • Topics:")
+                    for topic, count in nlargest(10, topics.items(), key=itemgetter(1)):
+                        lines.append(f"    - {topic}: {count} documents")
             except Exception as e:
-                print(f"\\n📚 Knowledge Base: ❌ Error getting stats: {e}")
+                lines.append(f"\\n📚 Knowledge Base: {_FAIL} Error getting stats: {e}")
         else:
-            print("\\n📚 Knowledge Base: ❌ Not available")
+            lines.append(f"\\n📚 Knowledge Base: {_FAIL} Not available")
         
         # Project statistics
         try:
-            project_stats = project_service.list_projects()
-            print("\\n📁 Project Statistics:")
-            print(f"  • Total Projects: {project_stats['count']}")
-            if project_stats['projects']:
-                print("  • Recent Projects:")
-                for project in project_stats['projects'][:5]:  # Show first 5
-                    print(f"    - {project['name']} (created: {project['created'][:10]})")
+            project_stats = self._cached('projects', 5.0, _projects().list_projects)
+            projects = project_stats['projects']
+            lines.append("\\n📁 Project Statistics:")
+            lines.append(f"  • Total Projects: {project_stats['count']}")
+            if projects:
+                lines.append("  • Recent Projects:")
+                for project in projects[:5]:  # Show first 5
+                    lines.append(f"    - {project['name']} (created: {project['created'][:10]})")
         except Exception as e:
-            print(f"\\n📁 Projects: ❌ Error getting stats: {e}")
+            lines.append(f"\\n📁 Projects: {_FAIL} Error getting stats: {e}")
         
         # Docker statistics
-        if docker_service.is_docker_available():
+        if self._cached('docker_available', 10.0, _docker().is_docker_available):
             try:
-                images = docker_service.list_images()
-                algo_images = [img for img in images if 'algo' in img['repository'].lower()]
-                print("\\n🐳 Docker Statistics:")
-                print(f"  • Docker Status: ✅ Available")
-                print(f"  • Trading Algorithm Images: {len(algo_images)}")
-                if algo_images:
-                    print("  • Recent Images:")
-                    for img in algo_images[:3]:  # Show first 3
-                        print(f"    - {img['repository']}:{img['tag']} ({img['size']})")
+                images = self._cached('docker_images', 10.0, _docker().list_images)
+                # Count and keep the preview in one pass instead of
+                # materializing the filtered list and slicing it
+                algo_count = 0
+                preview = []
+                for img in images:
+                    if 'algo' in img['repository'].lower():
+                        algo_count += 1
+                        if len(preview) < 3:  # Show first 3
+                            preview.append(img)
+                lines.append("\\n🐳 Docker Statistics:")
+                lines.append(f"  • Docker Status: {_OK} Available")
+                lines.append(f"  • Trading Algorithm Images: {algo_count}")
+                if preview:
+                    lines.append("  • Recent Images:")
+                    for img in preview:
+                        lines.append(f"    - {img['repository']}:{img['tag']} ({img['size']})")
             except Exception as e:
-                print(f"\\n🐳 Docker: ⚠️  Available but error getting stats: {e}")
+                lines.append(f"\\n🐳 Docker: {_WARN}  Available but error getting stats: {e}")
         else:
-            print("\\n🐳 Docker: ❌ Not available")
+            lines.append(f"\\n🐳 Docker: {_FAIL} Not available")
+        sys.stdout.write("\n".join(lines) + "\n")
     
+    def _run_probes(self) -> List[Any]:
+        """Run the agent/RAG/Docker/project probes concurrently.
+
+        Returns results in fixed order (agent stats, RAG stats, Docker
+        availability, project listing); a failed probe yields its
+        exception instead of raising. Results land in _stat_cache, so
+        the next status command within the TTL is free.
+        """
+        futures = [
+            _HEALTH_POOL.submit(self._cached, 'agent_stats', 2.0, self.agent.get_agent_stats),
+            _HEALTH_POOL.submit(
+                self._cached, 'rag_stats', 5.0,
+                _rag().get_collection_stats) if _rag() else None,
+            _HEALTH_POOL.submit(self._cached, 'docker_available', 10.0, _docker().is_docker_available),
+            _HEALTH_POOL.submit(self._cached, 'projects', 5.0, _projects().list_projects),
+        ]
+        results = []
+        for future in futures:
+            if future is None:
+                results.append(None)
+                continue
+            try:
+                results.append(future.result(timeout=5))
+            except Exception as e:
+                results.append(e)
+        return results
+
     def _show_health_check(self):
         """Show comprehensive health check."""
-        print("\\n🏥 System Health Check:\\n")
+        lines = []
+        lines.append("\\n🏥 System Health Check:\\n")
         
-        health_status = "✅ HEALTHY"
+        health_status = f"{_OK} HEALTHY"
         issues = []
-        
+
+        # Run all four probes concurrently; each waits on I/O (Docker
+        # socket, Chroma, filesystem), so latency drops from sum to max
+        results = self._run_probes()
+        agent_res, rag_res, docker_res, projects_res = results
+
         # Check agent
-        try:
-            self.agent.get_agent_stats()
-            print("🤖 Agent: ✅ Healthy")
-        except Exception as e:
-            print(f"🤖 Agent: ❌ Error - {e}")
+        if isinstance(agent_res, Exception):
+            lines.append(f"🤖 Agent: {_FAIL} Error - {agent_res}")
             issues.append("Agent has issues")
-            health_status = "⚠️  DEGRADED"
-        
+            health_status = f"{_WARN}  DEGRADED"
+        else:
+            lines.append(f"🤖 Agent: {_OK} Healthy")
+
         # Check RAG service
-        if rag_service:
-            try:
-                rag_service.get_collection_stats()
-                print("📚 Knowledge Base: ✅ Healthy")
-            except Exception as e:
-                print(f"📚 Knowledge Base: ❌ Error - {e}")
+        if _rag():
+            if isinstance(rag_res, Exception):
+                lines.append(f"📚 Knowledge Base: {_FAIL} Error - {rag_res}")
                 issues.append("Knowledge base connection issues")
-                health_status = "⚠️  DEGRADED"
+                health_status = f"{_WARN}  DEGRADED"
+            else:
+                lines.append(f"📚 Knowledge Base: {_OK} Healthy")
         else:
-            print("📚 Knowledge Base: ⚠️  Not installed (ChromaDB missing)")
+            lines.append(f"📚 Knowledge Base: {_WARN}  Not installed (ChromaDB missing)")
             issues.append("ChromaDB not available")
-        
+
         # Check Docker
-        if docker_service.is_docker_available():
-            print("🐳 Docker: ✅ Healthy")
+        if docker_res is True:
+            lines.append(f"🐳 Docker: {_OK} Healthy")
         else:
-            print("🐳 Docker: ⚠️  Not available")
+            lines.append(f"🐳 Docker: {_WARN}  Not available")
             issues.append("Docker not available")
-        
+
         # Check project service
-        try:
-            project_service.list_projects()
-            print("📁 Project Service: ✅ Healthy")
-        except Exception as e:
-            print(f"📁 Project Service: ❌ Error - {e}")
+        if isinstance(projects_res, Exception):
+            lines.append(f"📁 Project Service: {_FAIL} Error - {projects_res}")
             issues.append("Project service issues")
-            health_status = "❌ UNHEALTHY"
+            health_status = f"{_FAIL} UNHEALTHY"
+        else:
+            lines.append(f"📁 Project Service: {_OK} Healthy")
         
-        print(f"\\n🏥 Overall Status: {health_status}")
+        lines.append(f"\\n🏥 Overall Status: {health_status}")
         if issues:
-            print("\\n⚠️  Issues Found:")
+            lines.append(f"\\n{_WARN}  Issues Found:")
             for issue in issues:
-                print(f"  • {issue}")
-            print("\\n💡 Recommendations:")
+                lines.append(f"  • {issue}")
+            lines.append("\\n💡 Recommendations:")
             if "ChromaDB not available" in issues:
-                print("  • Install ChromaDB: pip install chromadb")
+                lines.append("  • Install ChromaDB: pip install chromadb")
             if "Docker not available" in issues:
-                print("  • Install Docker and ensure it's running")
+                lines.append("  • Install Docker and ensure it's running")
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def _show_help(self):
         """Show comprehensive help information."""
@@ -291,40 +483,18 @@ class CLI:
     
     def _show_routing_info(self):
         """Show routing system information."""
-        print("\n🧠 Intelligent Routing System Status:\n")
-        
-        agent_stats = self.agent.get_agent_stats()
+        agent_stats = self._cached('agent_stats', 2.0, self.agent.get_agent_stats)
         routing_enabled = agent_stats.get('routing_enabled', False)
-        
-        print(f"🔀 Status: {'✅ Enabled' if routing_enabled else '❌ Disabled'}")
-        
-        if routing_enabled:
-            print("\n📋 Available Routes:")
-            print("  • algorithm_generation - Code generation and Docker operations")
-            print("  • technical_analysis - MFI analysis and stock/crypto signals")
-            print("  • rag_search - Knowledge base and strategy searches")  
-            print("  • mixed_analysis - Combined technical + algorithm/search requests")
-            print("  • general_agent - General trading questions and explanations")
-            
-            print("\n🎯 How Routing Works:")
-            print("  • Queries are automatically classified using AI")
-            print("  • Each route uses optimized tools and context")
-            print("  • Technical analysis gets real-time market data")
-            print("  • Algorithm requests get specialized code generation")
-            print("  • Mixed requests combine multiple capabilities")
-            
-            print("\n💡 Benefits:")
-            print("  • Faster, more focused responses")
-            print("  • Automatic symbol extraction and analysis")
-            print("  • Context-aware tool selection")
-            print("  • Optimized for different query types")
-        else:
-            print("\n⚠️  Routing is disabled - using fallback mode")
-            print("  • All queries processed with standard agent")
-            print("  • Use 'routing toggle' to enable intelligent routing")
+
+        status = f'{_OK} Enabled' if routing_enabled else f'{_FAIL} Disabled'
+        body = _ROUTING_ENABLED_TEXT if routing_enabled else _ROUTING_DISABLED_TEXT
+        sys.stdout.write(
+            f"\n🧠 Intelligent Routing System Status:\n\n🔀 Status: {status}{body}\n"
+        )
     
     def _handle_routing_command(self, command: str):
         """Handle routing-related commands."""
+        self._stat_cache.clear()  # routing state feeds the cached stats
         if command.lower() == 'toggle':
             current_status = self.agent.toggle_routing()
             status_text = "enabled" if current_status else "disabled"
@@ -1,59 +1,63 @@
 """Default configuration values for the trading agent."""
 
+from types import MappingProxyType
 from typing import Dict, Any
 
 # Default strategy parameters
-DEFAULT_STRATEGY_PARAMS = {
+DEFAULT_STRATEGY_PARAMS = MappingProxyType({
     'imbalance_threshold': 0.6,
     'min_volume_threshold': 10.0,
     'lookback_periods': 5,
     'signal_cooldown_ms': 100,
-}
+})
 
 # Default template values
-DEFAULT_TEMPLATE_VALUES = {
+DEFAULT_TEMPLATE_VALUES = MappingProxyType({
     'strategy_name': 'Generic Trading Strategy',
     'strategy_description': 'AI-generated cryptocurrency trading algorithm',
     'strategy_class_name': 'GenericStrategy',
     'project_name': 'generic-algo',
     'base_name': 'generic',
     **DEFAULT_STRATEGY_PARAMS
-}
+})
 
 # API configuration
-DEFAULT_API_CONFIG = {
+DEFAULT_API_CONFIG = MappingProxyType({
     'host': '0.0.0.0',
     'port': 8004,
     'cors_origins': ['http://localhost:5173', 'http://localhost:3000'],
     'max_chat_history': 20,
-}
+    'access_log': False,
+    'workers': 1,
+})
 
 # Docker configuration
-DEFAULT_DOCKER_CONFIG = {
+DEFAULT_DOCKER_CONFIG = MappingProxyType({
     'build_timeout': 300,  # 5 minutes
     'signal_output_port': 9999,
     'signal_output_bind_ip': '0.0.0.0',
-}
+})
 
 # LangChain configuration
-DEFAULT_LANGCHAIN_CONFIG = {
+DEFAULT_LANGCHAIN_CONFIG = MappingProxyType({
     'model': 'gemini-2.5-flash',
     'temperature': 0.1,
     'max_iterations': 5,
     'verbose': True,
-}
+    'max_concurrent_llm': 8,
+})
 
 # ChromaDB configuration
-DEFAULT_CHROMADB_CONFIG = {
+DEFAULT_CHROMADB_CONFIG = MappingProxyType({
     'persist_directory': './algorithm_chromadb',
     'collection_name': 'trading_strategies',
     'embedding_model': 'all-MiniLM-L6-v2',
-}
+})
 
 # File paths
-DEFAULT_PATHS = {
+DEFAULT_PATHS = MappingProxyType({
     'generated_algorithms': 'generated_algorithms',
     'rust_template': 'rust_template.rs',
     'dockerfile_template': 'dockerfile_template.dockerfile',
     'chromadb_path': './algorithm_chromadb',
-}
\ No newline at end of file
+})
\ No newline at end of file
@@ -1,42 +1,66 @@
 """Input validation functions for the trading agent."""
 
 import re
+import string
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+# Precompiled at import so hot validators skip the re-module cache
+# lookup and lock on every call
+_PROJECT_NAME_RE = re.compile(r'[^a-zA-Z0-9_-]')
+_DOCKER_NAME_RE = re.compile(r'[^a-z0-9_.-]')
+
+# Deletion tables for str.translate: a single C pass beats the regex
+# engine for plain character-class stripping. They only cover ASCII, so
+# non-ASCII names fall back to the compiled regexes above.
+_PROJECT_NAME_TABLE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if c not in string.ascii_letters + string.digits + '_-'
+))
+_DOCKER_NAME_TABLE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if c not in string.ascii_lowercase + string.digits + '_.-'
+))
+_HOST_RE = re.compile(r'^[a-zA-Z0-9.-]+$')
+_WORD_RE = re.compile(r'[a-zA-Z0-9]+')
+_TERM_RE = re.compile(r'[a-z]+')
+
+# Known trading vocabulary for sanitize_trading_terms; frozenset gives
+# O(1) membership per token
+_TRADING_TERMS = frozenset({
+    'rsi', 'macd', 'ema', 'sma', 'bollinger', 'momentum', 'scalping',
+    'arbitrage', 'grid', 'dca', 'swing', 'day', 'trend', 'reversal',
+    'breakout', 'support', 'resistance', 'volume', 'volatility', 'stochastic',
+    'fibonacci', 'pivot', 'moving', 'average', 'crossover', 'divergence'
+})
+
 
 class ValidationError(Exception):
     """Custom exception for validation errors."""
     pass
 
 
+# Table-driven spec for validate_strategy_params:
+# (name, accepted types, default, predicate, cast, error message)
+_STRATEGY_SPEC = (
+    ('imbalance_threshold', (int, float), 0.6, lambda v: 0.0 <= v <= 1.0, float,
+     "imbalance_threshold must be a number between 0.0 and 1.0"),
+    ('min_volume_threshold', (int, float), 10.0, lambda v: v >= 0, float,
+     "min_volume_threshold must be a positive number"),
+    ('lookback_periods', int, 5, lambda v: v >= 1, int,
+     "lookback_periods must be a positive integer"),
+    ('signal_cooldown_ms', int, 100, lambda v: v >= 0, int,
+     "signal_cooldown_ms must be a non-negative integer"),
+)
+
+
 def validate_strategy_params(params: Dict[str, Any]) -> Dict[str, Any]:
-    """Validate strategy parameters."""
+    """Validate strategy parameters against _STRATEGY_SPEC."""
     validated = {}
     
-    # Imbalance threshold (0.0 to 1.0)
-    threshold = params.get('imbalance_threshold', 0.6)
-    if not isinstance(threshold, (int, float)) or not 0.0 <= threshold <= 1.0:
-        raise ValidationError("imbalance_threshold must be a number between 0.0 and 1.0")
-    validated['imbalance_threshold'] = float(threshold)
-    
-    # Min volume threshold (positive number)
-    volume = params.get('min_volume_threshold', 10.0)
-    if not isinstance(volume, (int, float)) or volume < 0:
-        raise ValidationError("min_volume_threshold must be a positive number")
-    validated['min_volume_threshold'] = float(volume)
-    
-    # Lookback periods (positive integer)
-    lookback = params.get('lookback_periods', 5)
-    if not isinstance(lookback, int) or lookback < 1:
-        raise ValidationError("lookback_periods must be a positive integer")
-    validated['lookback_periods'] = lookback
-    
-    # Signal cooldown (positive integer)
-    cooldown = params.get('signal_cooldown_ms', 100)
-    if not isinstance(cooldown, int) or cooldown < 0:
-        raise ValidationError("signal_cooldown_ms must be a non-negative integer")
-    validated['signal_cooldown_ms'] = cooldown
+    for name, types, default, predicate, cast, message in _STRATEGY_SPEC:
+        value = params.get(name, default)
+        if not isinstance(value, types) or not predicate(value):
+            raise ValidationError(message)
+        validated[name] = cast(value)
     
     return validated
 
@@ -47,7 +71,11 @@ def validate_project_name(name: str) -> str:
         raise ValidationError("Project name must be a non-empty string")
     
     # Remove invalid characters and convert to lowercase
-    sanitized = re.sub(r'[^a-zA-Z0-9_-]', '', name.strip().lower())
+    name = name.strip().lower()
+    if name.isascii():
+        sanitized = name.translate(_PROJECT_NAME_TABLE)
+    else:
+        sanitized = _PROJECT_NAME_RE.sub('', name)
     
     if not sanitized:
         raise ValidationError("Project name contains no valid characters")
@@ -68,7 +96,11 @@ def validate_docker_name(name: str) -> str:
         raise ValidationError("Docker name must be a non-empty string")
     
     # Docker image names must be lowercase and follow specific rules
-    sanitized = re.sub(r'[^a-z0-9_.-]', '', name.strip().lower())
+    name = name.strip().lower()
+    if name.isascii():
+        sanitized = name.translate(_DOCKER_NAME_TABLE)
+    else:
+        sanitized = _DOCKER_NAME_RE.sub('', name)
     
     if not sanitized:
         raise ValidationError("Docker name contains no valid characters")
@@ -147,7 +179,7 @@ def validate_host(host: str) -> str:
     host = host.strip()
     
     # Basic validation - could be enhanced with more sophisticated IP/hostname validation
-    if not re.match(r'^[a-zA-Z0-9.-]+$', host):
+    if not _HOST_RE.match(host):
         raise ValidationError("Host contains invalid characters")
     
     return host
@@ -159,7 +191,7 @@ def sanitize_name_for_class(name: str) -> str:
         return "GenericStrategy"
     
     # Remove non-alphanumeric characters and convert to title case
-    words = re.findall(r'[a-zA-Z0-9]+', name)
+    words = _WORD_RE.findall(name)
     if not words:
         return "GenericStrategy"
     
@@ -173,19 +205,19 @@ def sanitize_name_for_class(name: str) -> str:
 
 
 def sanitize_trading_terms(description: str) -> List[str]:
-    """Extract and sanitize trading terms from description."""
-    trading_terms = [
-        'rsi', 'macd', 'ema', 'sma', 'bollinger', 'momentum', 'scalping',
-        'arbitrage', 'grid', 'dca', 'swing', 'day', 'trend', 'reversal',
-        'breakout', 'support', 'resistance', 'volume', 'volatility', 'stochastic',
-        'fibonacci', 'pivot', 'moving', 'average', 'crossover', 'divergence'
-    ]
-    
-    description_lower = description.lower()
-    found_terms = []
-    
-    for term in trading_terms:
-        if term in description_lower:
-            found_terms.append(term)
-    
-    return found_terms[:3]  # Limit to 3 most relevant terms
\ No newline at end of file
+    """Extract and sanitize trading terms from description.
+
+    Tokenizes the description in a single pass and checks each word
+    against the known vocabulary, stopping as soon as three distinct
+    terms are found.
+    """
+    found_terms: List[str] = []
+
+    for match in _TERM_RE.finditer(description.lower()):
+        word = match.group()
+        if word in _TRADING_TERMS and word not in found_terms:
+            found_terms.append(word)
+            if len(found_terms) == 3:  # Limit to 3 most relevant terms
+                break
+
+    return found_terms
\ No newline at end of file
@@ -1,11 +1,15 @@
-import sys
 import argparse
+import logging
+import os
+import sys
 
 from agents.finance_agent import FinanceAgent, FinanceAgentError
 from cli.interface import CLI
 
 def main():
     """Main entry point."""
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+
     parser = argparse.ArgumentParser(description="Trade Agent - Finance AI Assistant")
     parser.add_argument(
         "--mode", 
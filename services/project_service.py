@@ -1,6 +1,11 @@
 """Project creation and management service."""
 
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -14,12 +19,38 @@ from templates.manager import template_manager
 from templates.formatter import template_formatter
 from templates.validators import template_validator, TemplateValidationError
 
+logger = logging.getLogger(__name__)
+
 
 class ProjectCreationError(Exception):
     """Exception raised when project creation fails."""
     pass
 
 
+# Persistent worker pool for codegen: templating plus file I/O would otherwise
+# block the event loop thread, stalling every concurrent session. Threads (not
+# processes) because the work is I/O-dominated and the GIL is released during
+# writes.
+_CODEGEN_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="codegen")
+
+
+@lru_cache(maxsize=8)
+def _validate_static_template(kind: str, template: str):
+    """Validate a fixed template once per process instead of per project.
+
+    The Rust, Cargo, and Dockerfile templates never change between
+    invocations (the template manager serves them from its cache, so the
+    same str object - with its cached hash - keys every lookup), yet the
+    regex validation passes were re-run for each generated project.
+    Generated code still gets validated fresh every time.
+    """
+    if kind == 'rust':
+        return template_validator.validate_rust_template(template)
+    if kind == 'cargo':
+        return template_validator.validate_cargo_template(template)
+    return template_validator.validate_dockerfile_template(template)
+
+
 class ProjectService:
     """Service for creating and managing trading algorithm projects."""
     
@@ -62,19 +93,34 @@ class ProjectService:
         except Exception as e:
             raise ProjectCreationError(f"Project creation failed: {e}")
     
+    async def acreate_rust_project(self, algorithm_description: str, custom_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Async wrapper around create_rust_project.
+
+        Dispatches the blocking templating and file writes onto the shared
+        codegen pool so concurrent sessions' codegen requests run in parallel
+        without stalling the event loop.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            _CODEGEN_POOL,
+            partial(self.create_rust_project, algorithm_description, custom_params)
+        )
+
     def _generate_project_params(self, description: str, custom_params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate project parameters from description and custom inputs."""
         # Extract trading terms for naming
         trading_terms = sanitize_trading_terms(description)
         base_name = '-'.join(trading_terms[:2]) if trading_terms else 'generic-algo'
         
-        # Generate timestamp for unique naming
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Generate timestamps for unique naming from a single clock read, so
+        # the README timestamp matches the project directory name exactly
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         project_name = f"{base_name}_{timestamp}"
-        
+
         # Base parameters
         params = {
             'strategy_description': description,
+            'generated_at': now.strftime("%Y-%m-%d %H:%M:%S"),
             'base_name': base_name,
             'project_name': project_name,
             'strategy_name': ' '.join(term.capitalize() for term in trading_terms) + ' Strategy' if trading_terms else 'Generic Trading Strategy',
@@ -91,15 +137,14 @@ class ProjectService:
     def _create_project_directory(self, project_name: str) -> Path:
         """Create the project directory structure."""
         project_path = self.generated_algorithms_path / project_name
-        src_path = project_path / "src"
-        
+
         try:
-            # Create directories
-            project_path.mkdir(parents=True, exist_ok=True)
-            src_path.mkdir(exist_ok=True)
-            
+            # One makedirs on the deepest path creates the whole tree
+            # (single syscall chain instead of two stat/mkdir pairs)
+            os.makedirs(project_path / "src", exist_ok=True)
+
             return project_path
-            
+
         except OSError as e:
             raise ProjectCreationError(f"Failed to create project directory: {e}")
     
@@ -113,14 +158,19 @@ class ProjectService:
             ('README.md', self._generate_readme, params),
             ('.env.example', self._generate_env_example, params)
         ]
-        
-        for file_path, generator_func, file_params in files_to_create:
-            full_path = project_path / file_path
-            content = generator_func(file_params)
-            
+
+        # Render all contents first, then write sequentially: these are a
+        # handful of small files, so thread spawn/join overhead would eat
+        # any overlapped-write win, and submitting into _CODEGEN_POOL from
+        # a pool worker (the acreate_rust_project path) risks deadlock
+        contents = [
+            (file_path, project_path / file_path, generator_func(file_params))
+            for file_path, generator_func, file_params in files_to_create
+        ]
+
+        for file_path, full_path, content in contents:
             try:
-                with open(full_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                full_path.write_text(content, encoding='utf-8')
             except IOError as e:
                 raise ProjectCreationError(f"Failed to write {file_path}: {e}")
     
@@ -129,8 +179,8 @@ class ProjectService:
         try:
             template = template_manager.load_rust_template()
             
-            # Validate template
-            is_valid, issues = template_validator.validate_rust_template(template)
+            # Validate template (memoized: the template is static per process)
+            is_valid, issues = _validate_static_template('rust', template)
             if not is_valid:
                 raise TemplateValidationError(f"Rust template validation failed: {'; '.join(issues)}")
             
@@ -152,12 +202,14 @@ class ProjectService:
         try:
             template = template_manager.get_cargo_toml_template()
             
-            # Validate template
-            is_valid, issues = template_validator.validate_cargo_template(template)
+            # Validate template (memoized: the template is static per process)
+            is_valid, issues = _validate_static_template('cargo', template)
             if not is_valid:
                 raise TemplateValidationError(f"Cargo template validation failed: {'; '.join(issues)}")
-            
-            return template_formatter.safe_format(template, params)
+
+            # Fixed template: render via the pre-parsed string.Template rather
+            # than re-running str.format's parser on every codegen
+            return template_manager.render_cargo_toml(params)
             
         except Exception as e:
             raise ProjectCreationError(f"Failed to generate Cargo.toml: {e}")
@@ -167,11 +219,11 @@ class ProjectService:
         try:
             template = template_manager.load_dockerfile_template()
             
-            # Validate template
-            is_valid, issues = template_validator.validate_dockerfile_template(template)
+            # Validate template (memoized: the template is static per process)
+            is_valid, issues = _validate_static_template('dockerfile', template)
             if not is_valid:
                 # Log warnings but don't fail for Dockerfile validation
-                print(f"Dockerfile template warnings: {'; '.join(issues)}")
+                logger.warning("Dockerfile template warnings: %s", '; '.join(issues))
             
             return template_formatter.safe_format(template, params)
             
@@ -184,16 +236,27 @@ class ProjectService:
     
     def _generate_readme(self, params: Dict[str, Any]) -> str:
         """Generate README.md content."""
-        return f"""# {params['strategy_name']}
+        # Unpack once so the f-string below does local loads instead of
+        # repeated dict lookups per placeholder
+        strategy_name, strategy_description, base_name = (
+            params['strategy_name'], params['strategy_description'], params['base_name']
+        )
+        imbalance_threshold, min_volume_threshold, lookback_periods, signal_cooldown_ms = (
+            params['imbalance_threshold'], params['min_volume_threshold'],
+            params['lookback_periods'], params['signal_cooldown_ms']
+        )
+        generated_at = params.get('generated_at') or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        return f"""# {strategy_name}
 
 ## Description
-{params['strategy_description']}
+{strategy_description}
 
 ## Configuration
-- Imbalance Threshold: {params['imbalance_threshold']}
-- Min Volume Threshold: {params['min_volume_threshold']}
-- Lookback Periods: {params['lookback_periods']}
-- Signal Cooldown: {params['signal_cooldown_ms']}ms
+- Imbalance Threshold: {imbalance_threshold}
+- Min Volume Threshold: {min_volume_threshold}
+- Lookback Periods: {lookback_periods}
+- Signal Cooldown: {signal_cooldown_ms}ms
 
 ## Quick Start
 
@@ -207,26 +270,26 @@ cargo run
 ### Docker Deployment
 ```bash
 # Build Docker image
-docker build -t {params['base_name']}-algo:latest .
+docker build -t {base_name}-algo:latest .
 
 # Run container
-docker run --rm {params['base_name']}-algo:latest
+docker run --rm {base_name}-algo:latest
 
 # Run with port mapping (if applicable)
-docker run --rm -p 3000:3000 {params['base_name']}-algo:latest
+docker run --rm -p 3000:3000 {base_name}-algo:latest
 
 # Run in development mode with shell access
-docker run --rm -it {params['base_name']}-algo:latest /bin/sh
+docker run --rm -it {base_name}-algo:latest /bin/sh
 ```
 
 ### Environment Variables
 Customize the strategy with these environment variables:
 
 ```bash
-export IMBALANCE_THRESHOLD={params['imbalance_threshold']}
-export MIN_VOLUME_THRESHOLD={params['min_volume_threshold']}
-export LOOKBACK_PERIODS={params['lookback_periods']}
-export SIGNAL_COOLDOWN_MS={params['signal_cooldown_ms']}
+export IMBALANCE_THRESHOLD={imbalance_threshold}
+export MIN_VOLUME_THRESHOLD={min_volume_threshold}
+export LOOKBACK_PERIODS={lookback_periods}
+export SIGNAL_COOLDOWN_MS={signal_cooldown_ms}
 export STREAMING_SOURCE_IP=127.0.0.1
 export STREAMING_SOURCE_PORT=8888
 ```
@@ -245,7 +308,7 @@ export STREAMING_SOURCE_PORT=8888
 - Runs as non-root user for security
 - Includes health check for container monitoring
 
-Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+Generated on: {generated_at}
 """
     
     def _generate_env_example(self, params: Dict[str, Any]) -> str:
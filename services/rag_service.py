@@ -1,5 +1,7 @@
 """RAG (Retrieval-Augmented Generation) service with ChromaDB integration."""
 
+import functools
+import logging
 import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional
@@ -9,12 +11,53 @@ from datetime import datetime
 try:
     import chromadb
     from chromadb.config import Settings
+    from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
     CHROMADB_AVAILABLE = True
 except ImportError:
     CHROMADB_AVAILABLE = False
 
 from config.settings import settings
 
+logger = logging.getLogger(__name__)
+
+# Shared embedder for query-side caching. Collections created without an
+# explicit embedding function use Chroma's default, so embedding queries
+# here and passing query_embeddings is equivalent to query_texts - minus
+# the repeated model invocation for queries the agent has asked before.
+_query_embedder = None
+
+
+@functools.lru_cache(maxsize=4096)
+def _embed_query_cached(text: str) -> tuple:
+    """Embed a query once per process; identical queries hit the LRU.
+
+    Agent re-planning tends to repeat the same search verbatim, so the
+    second and later invocations skip the embedding model entirely.
+    Raises on embedder failure: lru_cache does not memoize exceptions,
+    so a transient error (e.g. the model still downloading) is retried
+    on the next call instead of pinning the query to the slow path.
+    """
+    global _query_embedder
+    if _query_embedder is None:
+        _query_embedder = DefaultEmbeddingFunction()
+    return tuple(float(v) for v in _query_embedder([text])[0])
+
+
+def _query_payload(query: str) -> Dict[str, Any]:
+    """Build the query argument for collection.query, cached when possible."""
+    try:
+        embedding = _embed_query_cached(query)
+    except Exception as e:
+        logger.debug(f"Query embedding failed, falling back to query_texts: {e}")
+        return {'query_texts': [query]}
+    return {'query_embeddings': [list(embedding)]}
+
+
+# Maximum cosine distance for a topic summary to count as a match; weaker
+# matches mean the topic index has nothing relevant, so the search falls
+# back to scanning the full collection instead of filtering recall away
+_TOPIC_MAX_DISTANCE = 0.6
+
 
 class RAGError(Exception):
     """Exception raised when RAG operations fail."""
@@ -31,6 +74,7 @@ class RAGService:
         self.config = settings.chromadb_config
         self.client = None
         self.collection = None
+        self.topics_collection = None
         self._initialize_client()
     
     def _initialize_client(self) -> None:
@@ -58,11 +102,64 @@ class RAGService:
                 # Collection doesn't exist, create it
                 self.collection = self.client.create_collection(
                     name=self.config['collection_name'],
-                    metadata={"description": "Trading strategies and algorithms knowledge base"}
+                    metadata={
+                        "description": "Trading strategies and algorithms knowledge base",
+                        # HNSW tuning: cosine space with wider graph links and
+                        # deeper construction keeps recall high while search
+                        # stays sub-millisecond as the corpus grows
+                        "hnsw:space": "cosine",
+                        "hnsw:M": 32,
+                        "hnsw:construction_ef": 200,
+                        "hnsw:search_ef": 64,
+                    }
                 )
-            
+
+            # Small first-level index: one entry per topic, queried before
+            # the chunk collection so searches only scan matching topics
+            topics_name = f"{self.config['collection_name']}_topics"
+            try:
+                self.topics_collection = self.client.get_collection(name=topics_name)
+            except ValueError:
+                self.topics_collection = self.client.create_collection(
+                    name=topics_name,
+                    metadata={
+                        "description": "Topic summaries for two-level retrieval",
+                        "hnsw:space": "cosine",
+                    }
+                )
+
+            self._backfill_topic_index()
+
         except Exception as e:
             raise RAGError(f"Failed to initialize ChromaDB: {e}")
+
+    def _backfill_topic_index(self) -> None:
+        """Populate the topic index from documents that predate it.
+
+        Corpora created before the two-level index existed start with an
+        empty topics collection; without backfill, the first add after the
+        upgrade would narrow every unfiltered search to that one topic and
+        silently hide every older topic.
+        """
+        try:
+            if self.topics_collection.count() > 0 or self.collection.count() == 0:
+                return
+
+            existing = self.collection.get(include=['metadatas', 'documents'])
+            seen: Dict[str, str] = {}
+            for metadata, doc in zip(existing.get('metadatas') or [],
+                                     existing.get('documents') or []):
+                topic = (metadata or {}).get('topic')
+                if topic and topic not in seen:
+                    seen[topic] = doc or ''
+
+            for topic, content in seen.items():
+                self._upsert_topic_summary(topic, content)
+            if seen:
+                logger.info(f"Backfilled topic index with {len(seen)} topics")
+        except Exception as e:
+            # The topic index is an accelerator, never a failure source
+            logger.debug(f"Topic index backfill failed: {e}")
     
     def add_document(self, content: str, topic: str, metadata: Optional[Dict[str, Any]] = None) -> str:
         """Add a document to the knowledge base."""
@@ -90,50 +187,120 @@ class RAGService:
                 ids=[doc_id],
                 metadatas=[doc_metadata]
             )
-            
+
+            self._upsert_topic_summary(topic, content)
+
             return doc_id
             
         except Exception as e:
             raise RAGError(f"Failed to add document: {e}")
     
-    def search_documents(self, query: str, n_results: int = 5, 
+    def search_documents(self, query: str, n_results: int = 5,
                         topic_filter: Optional[str] = None) -> List[Dict[str, Any]]:
         """Search documents in the knowledge base."""
+        try:
+            return list(self.stream_documents(query, n_results, topic_filter))
+        except RAGError:
+            raise
+        except Exception as e:
+            raise RAGError(f"Failed to search documents: {e}")
+
+    def _upsert_topic_summary(self, topic: str, content: str) -> None:
+        """Keep one short summary entry per topic in the first-level index."""
+        try:
+            self.topics_collection.upsert(
+                documents=[f"{topic}: {content[:200]}"],
+                ids=[hashlib.md5(topic.encode()).hexdigest()[:16]],
+                metadatas=[{'topic': topic}]
+            )
+        except Exception as e:
+            # The topic index is an accelerator, never a failure source
+            logger.debug(f"Topic summary upsert failed: {e}")
+
+    def _candidate_topics(self, query: str, k: int = 3) -> List[str]:
+        """Return the top-k topics whose summaries clearly match the query.
+
+        Topics beyond _TOPIC_MAX_DISTANCE are dropped rather than trusted:
+        an empty result means "no confident match" and the caller scans the
+        full collection instead of narrowing recall to weak candidates.
+        """
+        try:
+            if self.topics_collection is None or self.topics_collection.count() == 0:
+                return []
+            result = self.topics_collection.query(n_results=k, **_query_payload(query))
+            metadatas = (result.get('metadatas') or [[]])[0]
+            distances = (result.get('distances') or [[]])[0]
+
+            topics = []
+            for i, metadata in enumerate(metadatas):
+                if not metadata or 'topic' not in metadata:
+                    continue
+                if i < len(distances) and distances[i] is not None \
+                        and distances[i] > _TOPIC_MAX_DISTANCE:
+                    continue
+                topics.append(metadata['topic'])
+            return topics
+        except Exception as e:
+            logger.debug(f"Topic pre-search failed, falling back to flat scan: {e}")
+            return []
+
+    def stream_documents(self, query: str, n_results: int = 5,
+                         topic_filter: Optional[str] = None):
+        """Search and yield hits one at a time.
+
+        The ChromaDB query runs eagerly (so errors surface before any row
+        is produced) but rows are formatted lazily, letting streaming
+        callers emit each hit as soon as it is built instead of holding
+        the full formatted list in memory.
+        """
         try:
             if not self.collection:
                 raise RAGError("ChromaDB collection not initialized")
-            
-            # Prepare query filters
+
+            # Prepare query filters; without an explicit topic, narrow the
+            # scan to the topics whose summaries best match the query
+            # (two-level retrieval: topic index first, chunks second)
             where_filter = {}
             if topic_filter:
                 where_filter['topic'] = topic_filter
-            
+            else:
+                candidates = self._candidate_topics(query)
+                if candidates:
+                    where_filter = (
+                        {'topic': candidates[0]} if len(candidates) == 1
+                        else {'topic': {'$in': candidates}}
+                    )
+
             # Perform search
             results = self.collection.query(
-                query_texts=[query],
                 n_results=n_results,
-                where=where_filter if where_filter else None
+                where=where_filter if where_filter else None,
+                **_query_payload(query)
             )
-            
-            # Format results
-            formatted_results = []
-            if results['documents'] and results['documents'][0]:
-                for i, doc in enumerate(results['documents'][0]):
-                    metadata = results['metadatas'][0][i] if results['metadatas'] and results['metadatas'][0] else {}
-                    distance = results['distances'][0][i] if results['distances'] and results['distances'][0] else None
-                    
-                    formatted_results.append({
-                        'id': results['ids'][0][i] if results['ids'] and results['ids'][0] else '',
-                        'content': doc,
-                        'metadata': metadata,
-                        'relevance_score': 1 - distance if distance is not None else None,
-                        'topic': metadata.get('topic', 'Unknown')
-                    })
-            
-            return formatted_results
-            
+
+        except RAGError:
+            raise
         except Exception as e:
             raise RAGError(f"Failed to search documents: {e}")
+
+        return self._format_result_rows(results)
+
+    @staticmethod
+    def _format_result_rows(results: Dict[str, Any]):
+        """Yield formatted rows from a raw ChromaDB query result."""
+        if not (results['documents'] and results['documents'][0]):
+            return
+        for i, doc in enumerate(results['documents'][0]):
+            metadata = results['metadatas'][0][i] if results['metadatas'] and results['metadatas'][0] else {}
+            distance = results['distances'][0][i] if results['distances'] and results['distances'][0] else None
+
+            yield {
+                'id': results['ids'][0][i] if results['ids'] and results['ids'][0] else '',
+                'content': doc,
+                'metadata': metadata,
+                'relevance_score': 1 - distance if distance is not None else None,
+                'topic': metadata.get('topic', 'Unknown')
+            }
     
     def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific document by ID."""
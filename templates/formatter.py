@@ -1,6 +1,7 @@
 """Safe template formatting with automatic variable generation."""
 
 import re
+from functools import lru_cache
 from typing import Dict, Any, Set
 from datetime import datetime
 
@@ -25,10 +26,15 @@ class TemplateFormatter:
             'base_name': self._generate_base_name,
         }
     
+    @lru_cache(maxsize=16)
     def extract_template_variables(self, template_str: str) -> Set[str]:
-        """Extract all {variable} placeholders from template string."""
+        """Extract all {variable} placeholders from template string.
+
+        Cached because templates are immutable for the process lifetime, so
+        repeated codegen calls skip the regex scan entirely.
+        """
         return set(re.findall(r'\{(\w+)\}', template_str))
-    
+
     def generate_missing_values(self, required_vars: Set[str], provided_params: Dict[str, Any]) -> Dict[str, Any]:
         """Generate intelligent defaults for missing template variables."""
         missing_vars = required_vars - set(provided_params.keys())
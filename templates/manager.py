@@ -1,6 +1,7 @@
 """Template loading and management functionality."""
 
 import re
+import string
 from pathlib import Path
 from typing import Dict, Any, Set, Optional
 
@@ -13,6 +14,31 @@ class TemplateLoadError(Exception):
     pass
 
 
+# Pre-parsed $-style Cargo.toml template. string.Template.substitute runs only
+# the placeholder-replacement pass, skipping str.format's mini-language parser
+# (and the {{ }} escaping it forces on TOML inline tables) on every codegen.
+_CARGO_TOML_TEMPLATE = string.Template('''[package]
+name = "$project_name"
+version = "0.1.0"
+edition = "2021"
+description = "$strategy_description"
+authors = ["AI Agent <agent@example.com>"]
+
+[dependencies]
+serde = { version = "1.0", features = ["derive"] }
+serde_json = "1.0"
+crossbeam-channel = "0.5"
+ctrlc = "3.4"
+tokio = { version = "1.0", features = ["full"] }
+
+[profile.release]
+opt-level = 3
+lto = true
+codegen-units = 1
+panic = "abort"
+''')
+
+
 class TemplateManager:
     """Manages loading and caching of templates."""
     
@@ -104,6 +130,18 @@ codegen-units = 1
 panic = "abort"
 '''
     
+    def render_cargo_toml(self, params: Dict[str, Any]) -> str:
+        """Render Cargo.toml through the pre-parsed string.Template."""
+        description = str(params.get('strategy_description', ''))
+        if '\n' in description:
+            # Same multiline collapsing the formatter applies to descriptions
+            description = ' '.join(line.strip() for line in description.split('\n') if line.strip())
+
+        return _CARGO_TOML_TEMPLATE.substitute(
+            project_name=str(params.get('project_name', 'generated-algo')),
+            strategy_description=description
+        )
+
     def get_dockerignore_template(self) -> str:
         """Get the .dockerignore template."""
         return """# Git
@@ -1,5 +1,6 @@
 """Template validation functionality."""
 
+from functools import lru_cache
 from typing import Dict, Any, Set, List, Tuple
 import re
 
@@ -29,6 +30,7 @@ class TemplateValidator:
         
         self.required_dockerfile_variables = set()  # Dockerfile templates may have fewer requirements
     
+    @lru_cache(maxsize=8)
     def validate_rust_template(self, template_str: str) -> Tuple[bool, List[str]]:
         """Validate Rust template structure and required variables."""
         issues = []
@@ -57,6 +59,7 @@ class TemplateValidator:
         
         return len(issues) == 0, issues
     
+    @lru_cache(maxsize=8)
     def validate_cargo_template(self, template_str: str) -> Tuple[bool, List[str]]:
         """Validate Cargo.toml template structure."""
         issues = []
@@ -84,6 +87,7 @@ class TemplateValidator:
         
         return len(issues) == 0, issues
     
+    @lru_cache(maxsize=8)
     def validate_dockerfile_template(self, template_str: str) -> Tuple[bool, List[str]]:
         """Validate Dockerfile template structure."""
         issues = []
@@ -1,19 +1,39 @@
 """Technical Indicators Client for connecting to the technical-indicators-finder API."""
 
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, Any, List
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _build_shared_session() -> requests.Session:
+    """Build the process-wide session for the indicators API.
+
+    A single pooled session keeps TCP connections to the backend warm, so
+    concurrent fetches (e.g. the parallel context builds) reuse established
+    connections instead of paying a handshake per request.
+    """
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by every client instance unless one is injected explicitly
+_SHARED_SESSION = _build_shared_session()
+
+
 class TechnicalIndicatorsClient:
     """Client for interacting with the technical-indicators-finder API."""
-    
-    def __init__(self, base_url: str = "http://localhost:8005"):
+
+    def __init__(self, base_url: str = "http://localhost:8005",
+                 session: Optional[requests.Session] = None):
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json"})
+        self.session = session if session is not None else _SHARED_SESSION
     
     def health_check(self) -> bool:
         """Check if the technical indicators service is running"""
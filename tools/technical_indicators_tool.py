@@ -1,5 +1,6 @@
 """Technical indicators tools for the Finance Agent."""
 
+import asyncio
 import re
 import logging
 from typing import List, Dict, Optional
@@ -176,37 +177,76 @@ def extract_symbols_from_text(text: str) -> List[str]:
     return list(set(symbols))  # Remove duplicates
 
 
+def _format_symbol_context(symbol: str, signal_data: Optional[Dict]) -> List[str]:
+    """Format one symbol's signal data for the technical context block."""
+    if not signal_data:
+        return [f"\n**{symbol}**: No data available"]
+
+    parts = [
+        f"\n**{symbol}** (${signal_data['price']:.2f}):",
+        f"- MFI: {signal_data['mfi_value']:.1f}",
+        f"- Signal: {signal_data['signal']} ({signal_data['strength']})",
+    ]
+
+    # Add interpretation
+    mfi = signal_data['mfi_value']
+    if mfi >= 80:
+        parts.append("- Status: Potentially overbought")
+    elif mfi <= 20:
+        parts.append("- Status: Potentially oversold")
+    else:
+        parts.append("- Status: Normal trading range")
+
+    return parts
+
+
 def build_indicators_context(symbols: List[str]) -> str:
     """Build technical indicators context for multiple symbols."""
     if not client.health_check():
         return "\nNote: Technical indicators service is currently unavailable."
-    
+
     if not symbols:
         return ""
-    
+
     context_parts = []
     context_parts.append("\n**📊 Technical Analysis:**")
-    
+
     for symbol in symbols[:3]:  # Limit to 3 symbols for context
         try:
             signal_data = client.get_current_signal(symbol)
-            if signal_data:
-                context_parts.append(f"\n**{symbol}** (${signal_data['price']:.2f}):")
-                context_parts.append(f"- MFI: {signal_data['mfi_value']:.1f}")
-                context_parts.append(f"- Signal: {signal_data['signal']} ({signal_data['strength']})")
-                
-                # Add interpretation
-                mfi = signal_data['mfi_value']
-                if mfi >= 80:
-                    context_parts.append(f"- Status: Potentially overbought")
-                elif mfi <= 20:
-                    context_parts.append(f"- Status: Potentially oversold")
-                else:
-                    context_parts.append(f"- Status: Normal trading range")
-            else:
-                context_parts.append(f"\n**{symbol}**: No data available")
+            context_parts.extend(_format_symbol_context(symbol, signal_data))
         except Exception as e:
             logger.error(f"Error building context for {symbol}: {e}")
             continue
-    
-    return "".join(context_parts) if context_parts else ""
\ No newline at end of file
+
+    return "".join(context_parts) if context_parts else ""
+
+
+async def abuild_indicators_context(symbols: List[str]) -> str:
+    """Async variant of build_indicators_context with parallel fetches.
+
+    The client is requests-based, so each call runs on a worker thread via
+    asyncio.to_thread and all symbols are fetched with asyncio.gather -
+    N sequential HTTP round-trips collapse to roughly the slowest one, and
+    the event loop stays free for the caller throughout.
+    """
+    if not await asyncio.to_thread(client.health_check):
+        return "\nNote: Technical indicators service is currently unavailable."
+
+    if not symbols:
+        return ""
+
+    limited = symbols[:3]  # Limit to 3 symbols for context
+    results = await asyncio.gather(
+        *(asyncio.to_thread(client.get_current_signal, symbol) for symbol in limited),
+        return_exceptions=True
+    )
+
+    context_parts = ["\n**📊 Technical Analysis:**"]
+    for symbol, signal_data in zip(limited, results):
+        if isinstance(signal_data, Exception):
+            logger.error(f"Error building context for {symbol}: {signal_data}")
+            continue
+        context_parts.extend(_format_symbol_context(symbol, signal_data))
+
+    return "".join(context_parts)
\ No newline at end of file
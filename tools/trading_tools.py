@@ -1,9 +1,13 @@
+import logging
+
 from langchain.tools import tool
 
 from services.project_service import project_service, ProjectCreationError
 from services.docker_service import docker_service, DockerError
 from config.validation import validate_docker_name, sanitize_trading_terms
 
+logger = logging.getLogger(__name__)
+
 def sanitize_name(name: str) -> str:
     """Convert a strategy description into a valid Docker image name."""
     # Use the trading terms extraction from validation module
@@ -38,8 +42,10 @@ def generate_rust_crypto_algo(algo_description: str, build_docker: bool = False)
     - Build/create Docker image for algorithm
     """
     try:
-        print(f"\n[TOOL CALL] Generating Rust project with description:\n{algo_description}\n")
-        
+        # %s-style so the format only runs when DEBUG logging is enabled
+        logger.debug("Generating Rust project with description: %s", algo_description)
+
+
         # Create project using the project service
         project_result = project_service.create_rust_project(algo_description)
         
@@ -79,8 +85,8 @@ def generate_rust_crypto_algo(algo_description: str, build_docker: bool = False)
         # Build Docker image if requested
         if build_docker:
             try:
-                print(f"\n🐳 Building Docker image...")
                 image_name = f"{base_name}-algo"
+                logger.debug("Building Docker image %s", image_name)
                 docker_result = docker_service.build_image(project_path, image_name)
                 
                 if docker_result['success']: